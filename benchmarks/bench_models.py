@@ -0,0 +1,84 @@
+"""
+Benchmark: memory and construction speed of slotted vs. regular models.
+
+Usage:
+    pip install -e .
+    python benchmarks/bench_models.py [count]
+"""
+
+import sys
+import timeit
+import tracemalloc
+
+from klogs_pgw import models, slotted_models
+
+
+COMMISSION_DATA = {
+    "success": True,
+    "installments": [{"installment": 1, "rate": 1.5}]
+}
+
+
+def make_product(module, i):
+    return module.Product(id=str(i), category="books", quantity=1.0,
+                          code="SKU", description="Product", price=9.99)
+
+
+def make_payment(module, i):
+    return module.CreatePaymentRequest(
+        amount=100.0,
+        installment=1,
+        reference_code=f"REF-{i}",
+        charge_type=models.ChargeType.DIRECT_SALE,
+        currency="TRY"
+    )
+
+
+def make_commission(module, i):
+    return module.CommissionResponse.from_dict(COMMISSION_DATA)
+
+
+def measure_memory(factory, module, count):
+    """Bytes allocated per object (including its field values), excluding the holding list."""
+    tracemalloc.start()
+    objects = [None] * count
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        objects[i] = factory(module, i)
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return used / count
+
+
+def measure_time(factory, module, count):
+    """Microseconds per object construction."""
+    timer = timeit.Timer(lambda: factory(module, 0))
+    loops = max(1, count // 10)
+    return min(timer.repeat(repeat=5, number=loops)) / loops * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    cases = [
+        ("Product", make_product),
+        ("CreatePaymentRequest", make_payment),
+        ("CommissionResponse.from_dict", make_commission)
+    ]
+
+    print(f"{'case':<30} {'variant':<10} {'bytes/obj':>10} {'us/obj':>8}")
+    for name, factory in cases:
+        for label, module in (("dataclass", models), ("slotted", slotted_models)):
+            memory = measure_memory(factory, module, count)
+            elapsed = measure_time(factory, module, count)
+            print(f"{name:<30} {label:<10} {memory:>10.0f} {elapsed:>8.2f}")
+
+    payment = make_payment(models, 0)
+    slotted_payment = make_payment(slotted_models, 0)
+    for label, obj in (("dataclass", payment), ("slotted", slotted_payment)):
+        timer = timeit.Timer(obj.to_dict)
+        elapsed = min(timer.repeat(repeat=5, number=10000)) / 10000 * 1e6
+        print(f"{'CreatePaymentRequest.to_dict':<30} {label:<10} {'':>10} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
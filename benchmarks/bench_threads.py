@@ -0,0 +1,119 @@
+"""
+Benchmark: throughput of one shared KlogsClient from 1 to 256 threads.
+
+Runs two workloads for each thread count:
+
+- ``sign``: request signing only (nonce, timestamp, HMAC), no network
+- ``http``: full ``create_payment_token()`` calls against a local stub
+  gateway started in a separate process (or ``--url``)
+
+Run it on both a regular and a free-threaded CPython build (``python3.13t``)
+to compare scaling; the interpreter's GIL status is printed first.
+
+Usage:
+    pip install -e .
+    python benchmarks/bench_threads.py [--duration SECONDS] [--url URL]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from klogs_pgw import KlogsClient
+
+
+THREAD_COUNTS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    payload = json.dumps({"success": True, "token": "bench"}).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.payload)))
+        self.end_headers()
+        self.wfile.write(self.payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    print(server.server_port, flush=True)
+    server.serve_forever()
+
+
+def run(threads: int, duration: float, work) -> float:
+    """Calls per second with ``threads`` threads calling ``work`` in a loop."""
+    counts = [0] * threads
+    start = threading.Barrier(threads + 1)
+    stop = threading.Event()
+
+    def worker(index):
+        start.wait()
+        done = 0
+        while not stop.is_set():
+            work()
+            done += 1
+        counts[index] = done
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - began)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--url", help="Gateway or stub URL (default: start a local stub)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve()
+        return
+
+    gil = sys._is_gil_enabled() if hasattr(sys, "_is_gil_enabled") else True
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+
+    stub = None
+    url = args.url
+    if url is None:
+        stub = subprocess.Popen([sys.executable, __file__, "--serve"],
+                                stdout=subprocess.PIPE, text=True)
+        url = f"http://127.0.0.1:{stub.stdout.readline().strip()}"
+
+    client = KlogsClient(api_key="bench-key", secret_key="bench-secret",
+                         base_url=url, pool_size=max(THREAD_COUNTS))
+    http = client._http_client
+
+    try:
+        print(f"{'threads':>7} {'sign/s':>12} {'http/s':>10}")
+        for threads in THREAD_COUNTS:
+            sign_rate = run(threads, args.duration, http._get_headers)
+            http_rate = run(threads, args.duration, client.card_payment.create_payment_token)
+            print(f"{threads:>7} {sign_rate:>12.0f} {http_rate:>10.0f}")
+    finally:
+        http.close()
+        if stub:
+            stub.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 """Klogs Payment Gateway Python Client"""
 
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple, Union
 
+from .audit import AuditLogger
 from .client import KlogsHttpClient
+from .endpoints import EndpointSpec
+from .scheduler import Priority, RequestScheduler
+from .idempotency import IdempotencyRegistry
 from .services.card_payment import CardPaymentService
 
 
@@ -14,7 +18,17 @@ class KlogsClient:
     
     def __init__(self, api_key: str, secret_key: str, 
                  base_url: str = "https://pgw.klogs.io",
-                 additional_headers: Optional[Dict[str, str]] = None):
+                 additional_headers: Optional[Dict[str, str]] = None,
+                 stream_body: bool = False, compress_body: bool = False,
+                 endpoints: Optional[List[EndpointSpec]] = None,
+                 dns_ttl: Optional[float] = None,
+                 timeout: Optional[Union[float, Tuple[float, float]]] = None,
+                 audit_logger: Optional[AuditLogger] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 pool_size: int = 10,
+                 idempotency_registry: Optional[IdempotencyRegistry] = None,
+                 proxies: Optional[Dict[str, str]] = None,
+                 verify: Union[bool, str] = True):
         """
         Initialize Klogs Payment Gateway client.
         
@@ -23,6 +37,20 @@ class KlogsClient:
             secret_key: Secret key for authentication
             base_url: Base URL for the API (default: https://pgw.klogs.io)
             additional_headers: Additional headers to include in all requests
+            stream_body: Stream request bodies with chunked transfer encoding
+            compress_body: Gzip-compress request bodies
+            endpoints: Additional base URLs, or (base_url, address) tuples
+                pinned to an IP address, to fail over to
+            dns_ttl: Cache DNS lookups in-process for this many seconds
+            timeout: Request timeout, as seconds or (connect, read)
+            audit_logger: Audit log that every gateway call is recorded to;
+                a masked summary of each body is taken when the call is made
+            scheduler: Scheduler limiting concurrent requests by priority
+            pool_size: Maximum connections kept open to the gateway
+            idempotency_registry: Registry deduplicating payments that share
+                a reference code
+            proxies: Proxy URLs by scheme
+            verify: TLS verification flag or CA bundle path
         
         Example:
             >>> client = KlogsClient(
@@ -35,11 +63,31 @@ class KlogsClient:
             base_url=base_url,
             api_key=api_key,
             secret_key=secret_key,
-            additional_headers=additional_headers
+            additional_headers=additional_headers,
+            stream_body=stream_body,
+            compress_body=compress_body,
+            endpoints=endpoints,
+            dns_ttl=dns_ttl,
+            timeout=timeout,
+            audit_logger=audit_logger,
+            scheduler=scheduler,
+            pool_size=pool_size,
+            proxies=proxies,
+            verify=verify
         )
         
         # Initialize services
-        self._card_payment = CardPaymentService(self._http_client)
+        self._card_payment = CardPaymentService(self._http_client, idempotency_registry)
+    
+    @property
+    def http_client(self) -> KlogsHttpClient:
+        """
+        Get the underlying HTTP client.
+        
+        Returns:
+            KlogsHttpClient instance
+        """
+        return self._http_client
     
     @property
     def card_payment(self) -> CardPaymentService:
@@ -50,6 +98,27 @@ class KlogsClient:
             CardPaymentService instance
         """
         return self._card_payment
+    
+    def endpoint_stats(self) -> List[dict]:
+        """
+        Get health, latency and selection counts for each gateway endpoint.
+        
+        Returns:
+            List of per-endpoint statistics
+        """
+        return self._http_client.endpoint_stats()
+    
+    def scheduler_stats(self) -> Optional[dict]:
+        """
+        Get scheduler queue depths and wait times.
+        
+        Returns:
+            Scheduler statistics, or None if no scheduler is configured
+        """
+        return self._http_client.scheduler_stats()
+
+
+from .multi_tenant import MultiTenantKlogsClient
 
 
 # Export main classes and models
@@ -71,6 +140,8 @@ from .models import (
 
 __all__ = [
     'KlogsClient',
+    'MultiTenantKlogsClient',
+    'Priority',
     'CreatePaymentRequest',
     'CreditCard',
     'Reward',
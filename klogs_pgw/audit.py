@@ -0,0 +1,260 @@
+"""Klogs Payment Gateway - Asynchronous Audit Log"""
+
+import atexit
+import json
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from enum import Enum
+from typing import Any, Optional
+
+from .utils import ShardedCounter
+
+
+# Wire (camelCase) and model (snake_case) names of sensitive fields
+_PAN_KEYS = frozenset(["cardNumber", "card_number"])
+_SECRET_KEYS = frozenset(["cvv"])
+_NATIONAL_ID_KEYS = frozenset(["nationalNumber", "national_number"])
+
+# (wire name, model attribute) of the scalar fields kept in audit records
+_SUMMARY_FIELDS = (
+    ("referenceCode", "reference_code"),
+    ("amount", "amount"),
+    ("currency", "currency"),
+    ("installment", "installment"),
+    ("chargeType", "charge_type"),
+    ("binNumber", "bin_number")
+)
+
+
+def _mask(value: Any, keep_start: int, keep_end: int) -> Any:
+    if not isinstance(value, str):
+        return None if value is None else "***"
+    if len(value) <= keep_start + keep_end:
+        return "*" * len(value)
+    return value[:keep_start] + "*" * (len(value) - keep_start - keep_end) + \
+        (value[-keep_end:] if keep_end else "")
+
+
+def redact(data: Any) -> Any:
+    """
+    Return a copy of request data with card and identity fields masked.
+
+    Card numbers keep their first six and last four digits, national numbers
+    keep their last two digits and CVVs are replaced with ``"***"``. Models are
+    converted with ``to_dict()`` at every level before masking.
+
+    Args:
+        data: Model, dictionary, list or scalar
+
+    Returns:
+        Redacted copy
+    """
+    if hasattr(data, 'to_dict'):
+        data = data.to_dict()
+    if isinstance(data, dict):
+        redacted = {}
+        for key, value in data.items():
+            if key in _PAN_KEYS:
+                value = _mask(value, 6, 4)
+            elif key in _SECRET_KEYS:
+                value = None if value is None else "***"
+            elif key in _NATIONAL_ID_KEYS:
+                value = _mask(value, 0, 2)
+            else:
+                value = redact(value)
+            redacted[key] = value
+        return redacted
+    if isinstance(data, (list, tuple)):
+        return [redact(item) for item in data]
+    return data
+
+
+def summarize(body: Any) -> Any:
+    """
+    Build the audit summary of a request body or query parameters.
+
+    Only immutable scalars are kept (reference code, amount, currency,
+    installment, charge type, BIN), plus the masked card number and the
+    product count, so the summary can be queued and written later even if
+    the caller reuses the body.
+
+    Args:
+        body: Model, dictionary, list or scalar
+
+    Returns:
+        Summary dictionary (or the scalar itself)
+    """
+    if body is None or isinstance(body, (str, int, float, bool)):
+        return body
+    if isinstance(body, (list, tuple)):
+        return {"length": len(body)}
+
+    if isinstance(body, Mapping):
+        def get(wire, attr):
+            value = body.get(wire)
+            return body.get(attr) if value is None else value
+    else:
+        def get(wire, attr):
+            return getattr(body, attr, None)
+
+    summary = {}
+    for wire, attr in _SUMMARY_FIELDS:
+        value = get(wire, attr)
+        if value is not None:
+            summary[wire] = value.value if isinstance(value, Enum) else value
+
+    card = get("card", "card")
+    if card is not None:
+        number = card.get("cardNumber") if isinstance(card, Mapping) else getattr(card, "card_number", None)
+        if number is not None:
+            summary["cardNumber"] = _mask(number, 6, 4)
+    products = get("products", "products")
+    if products:
+        summary["productCount"] = len(products)
+    return summary
+
+
+def _unserializable(value: Any) -> str:
+    # Never fall back to repr(), which could print card data
+    return f"<{type(value).__name__}>"
+
+
+class AuditLogger:
+    """
+    Audit log of gateway calls written by a background thread.
+
+    ``record`` takes a small summary of the body (see ``summarize``) and
+    appends it to a bounded in-memory ring buffer; JSON serialization and
+    batched file writes happen on the writer thread. Records that do not
+    fit in the buffer are dropped and counted rather than blocking the
+    caller. Records that cannot be serialized or written are counted as
+    errors; the writer keeps running.
+    """
+
+    def __init__(self, path: str, capacity: int = 8192, sample_rate: float = 1.0,
+                 batch_size: int = 256, flush_interval: float = 1.0):
+        """
+        Initialize audit logger and start its writer thread.
+
+        Args:
+            path: File to append JSON lines to
+            capacity: Maximum number of records waiting to be written
+            sample_rate: Fraction of calls to record (1.0 records every call)
+            batch_size: Maximum number of records written per batch
+            flush_interval: Seconds the writer waits between batches when idle
+        """
+        self.path = path
+        self.capacity = capacity
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.recorded = ShardedCounter()
+        self.dropped = ShardedCounter()
+        self.sampled_out = ShardedCounter()
+        self.written = 0
+        self.errors = 0
+        self._buffer = deque()
+        self._stop = threading.Event()
+        self._file = open(path, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._run, name='klogs-audit', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, method: str, resource_uri: str, body: Any = None,
+               status_code: Optional[int] = None, elapsed: Optional[float] = None,
+               error: Optional[str] = None) -> None:
+        """
+        Queue an audit record. Called on the request thread.
+
+        The body is summarized immediately, so later changes to it do not
+        affect the record.
+
+        Args:
+            method: HTTP method
+            resource_uri: Resource URI
+            body: Request body or query parameters
+            status_code: HTTP status code, if a response was received
+            elapsed: Request latency in seconds
+            error: Error description, if the request failed
+        """
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.sampled_out.add()
+            return
+        if len(self._buffer) >= self.capacity:
+            self.dropped.add()
+            return
+        # deque.append is atomic and counters are per-thread, so producers
+        # never take a shared lock
+        self._buffer.append((time.time(), method, resource_uri, summarize(body),
+                             status_code, elapsed, error))
+        self.recorded.add()
+
+    def stats(self) -> dict:
+        """
+        Get audit log counters.
+
+        Returns:
+            Dictionary of counters
+        """
+        return {
+            "recorded": self.recorded.value,
+            "written": self.written,
+            "dropped": self.dropped.value,
+            "sampledOut": self.sampled_out.value,
+            "errors": self.errors,
+            "pending": len(self._buffer)
+        }
+
+    def _format(self, entry) -> str:
+        timestamp, method, resource_uri, body, status_code, elapsed, error = entry
+        return json.dumps({
+            "timestamp": timestamp,
+            "method": method,
+            "uri": resource_uri,
+            "status": status_code,
+            "elapsed": elapsed,
+            "error": error,
+            "body": redact(body)
+        }, default=_unserializable)
+
+    def _drain(self) -> int:
+        lines = []
+        taken = 0
+        while taken < self.batch_size:
+            try:
+                entry = self._buffer.popleft()
+            except IndexError:
+                break
+            taken += 1
+            try:
+                lines.append(self._format(entry))
+            except Exception:
+                self.errors += 1
+        if lines:
+            try:
+                self._file.write('\n'.join(lines) + '\n')
+                self._file.flush()
+            except Exception:
+                self.errors += len(lines)
+            else:
+                self.written += len(lines)
+        return taken
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._drain() < self.batch_size:
+                self._stop.wait(self.flush_interval)
+        while self._drain():
+            pass
+
+    def close(self) -> None:
+        """Write out pending records and stop the writer thread."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self._file.close()
+        atexit.unregister(self.close)
@@ -2,57 +2,252 @@
 
 import requests
 import json
-from typing import Optional, Dict, Any
+import ssl
+import threading
+import time
+from typing import Optional, Dict, Any, List, Tuple, Union
 from urllib.parse import urljoin, urlencode
 
-from .utils import create_auth_headers, is_success_status_code
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NewConnectionError
+from urllib3.exceptions import SSLError as Urllib3SSLError
+
+from .utils import RequestSigner, is_success_status_code
 from .models import Response
+from .streaming import DEFAULT_CHUNK_SIZE, iter_json_chunks
+from .endpoints import DnsCache, DnsCachingAdapter, EndpointSelector, EndpointSpec, PinnedAddress
+from .audit import AuditLogger
+from .scheduler import Priority, RequestScheduler
+
+
+# Requests that can be replayed on another endpoint whatever the failure was
+IDEMPOTENT_METHODS = frozenset(["GET", "PUT", "DELETE"])
+
+# OpenSSL reasons raised while negotiating a connection, before any request
+# data has been written
+_TLS_HANDSHAKE_REASONS = frozenset([
+    "CERTIFICATE_VERIFY_FAILED",
+    "WRONG_VERSION_NUMBER",
+    "UNSUPPORTED_PROTOCOL",
+    "NO_PROTOCOLS_AVAILABLE",
+    "UNKNOWN_PROTOCOL",
+    "NO_SHARED_CIPHER"
+])
+
+
+def _is_tls_handshake_failure(error: BaseException) -> bool:
+    if isinstance(error, ssl.CertificateError):
+        return True
+    if not isinstance(error, ssl.SSLError):
+        return False
+    reason = error.reason or ""
+    return (reason in _TLS_HANDSHAKE_REASONS or "HANDSHAKE" in reason
+            or reason.startswith(("TLSV1_ALERT", "SSLV3_ALERT")))
+
+
+def _is_connect_failure(error: requests.RequestException) -> bool:
+    """
+    Check whether a request failed before anything was sent to the server.
+    
+    Args:
+        error: Exception raised by requests
+        
+    Returns:
+        True if the connection or its TLS handshake could not be established
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    if isinstance(reason, Urllib3SSLError):
+        reason = reason.args[0] if reason.args else None
+        return isinstance(reason, BaseException) and _is_tls_handshake_failure(reason)
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
 
 
 class KlogsHttpClient:
-    """Base HTTP client for Klogs API"""
+    """
+    Base HTTP client for Klogs API.
+    
+    Safe to share between threads: each thread gets its own
+    ``requests.Session``, and all sessions share one connection pool.
+    """
     
-    def __init__(self, base_url: str, api_key: str, secret_key: str, 
-                 additional_headers: Optional[Dict[str, str]] = None):
+    def __init__(self, base_url: str, api_key: Optional[str] = None,
+                 secret_key: Optional[str] = None,
+                 additional_headers: Optional[Dict[str, str]] = None,
+                 stream_body: bool = False, compress_body: bool = False,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 endpoints: Optional[List[EndpointSpec]] = None,
+                 dns_ttl: Optional[float] = None,
+                 timeout: Optional[Union[float, Tuple[float, float]]] = None,
+                 audit_logger: Optional[AuditLogger] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 pool_size: int = 10,
+                 proxies: Optional[Dict[str, str]] = None,
+                 verify: Union[bool, str] = True):
         """
         Initialize HTTP client.
         
         Args:
             base_url: Base URL for the API
-            api_key: API key for authentication
+            api_key: API key for authentication (may be omitted when every
+                request passes its own signer)
             secret_key: Secret key for authentication
             additional_headers: Additional headers to include in requests
+            stream_body: Stream POST/PUT bodies with chunked transfer encoding
+                instead of serializing them in full first
+            compress_body: Gzip-compress POST/PUT bodies (the gateway must
+                accept ``Content-Encoding: gzip``)
+            chunk_size: Size in bytes of streamed body chunks
+            endpoints: Additional base URLs to fail over to; the fastest
+                healthy one is used. An entry may be a (base_url, address)
+                tuple to connect to a fixed IP address while still using the
+                URL's hostname for the Host header, SNI and certificate checks
+            dns_ttl: Cache DNS lookups in-process for this many seconds
+            timeout: Requests timeout, as seconds or (connect, read); a short
+                connect timeout makes failover between endpoints fast
+            audit_logger: Audit log that every gateway call is recorded to
+            scheduler: Scheduler limiting concurrent requests by priority
+            pool_size: Maximum connections kept open per host; size this to
+                the number of threads sending requests concurrently
+            proxies: Proxy URLs by scheme, applied to every thread's session
+            verify: TLS verification flag or CA bundle path, applied to every
+                thread's session
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.secret_key = secret_key
+        self.signer = RequestSigner(api_key, secret_key) if api_key and secret_key else None
         self.additional_headers = additional_headers or {}
-        self.session = requests.Session()
+        self.stream_body = stream_body
+        self.compress_body = compress_body
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.audit_logger = audit_logger
+        self.scheduler = scheduler
+        self.proxies = dict(proxies or {})
+        self.verify = verify
+        
+        urls = [self.base_url]
+        for url in endpoints or []:
+            if isinstance(url, tuple):
+                url = (url[0].rstrip('/'), url[1])
+            else:
+                url = url.rstrip('/')
+            if url not in urls:
+                urls.append(url)
+        self.endpoint_selector = EndpointSelector(urls)
+        
+        if dns_ttl is not None:
+            self._adapter = DnsCachingAdapter(DnsCache(dns_ttl), pool_maxsize=pool_size)
+        else:
+            self._adapter = HTTPAdapter(pool_maxsize=pool_size)
+        # Endpoints pinned to an IP address get their own connection pools
+        self._pinned_adapters = {
+            endpoint.address: DnsCachingAdapter(PinnedAddress(endpoint.address), pool_maxsize=pool_size)
+            for endpoint in self.endpoint_selector.endpoints if endpoint.address
+        }
+        self._local = threading.local()
+    
+    @property
+    def session(self) -> requests.Session:
+        """
+        Get the calling thread's session, creating it on first use.
+        
+        Every thread has its own session, so settings changed on the
+        returned object only apply to the calling thread; set ``proxies``,
+        ``verify`` or ``additional_headers`` on the client instead.
+        
+        Returns:
+            requests.Session mounted on the shared connection pool
+        """
+        return self._session_for(None)
+    
+    def _session_for(self, address: Optional[str]) -> requests.Session:
+        """
+        Get the calling thread's session for an endpoint address.
+        
+        Args:
+            address: Pinned IP address, or None to resolve hostnames
+            
+        Returns:
+            requests.Session mounted on the matching connection pool
+        """
+        sessions = getattr(self._local, 'sessions', None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+        session = sessions.get(address)
+        if session is None:
+            adapter = self._pinned_adapters[address] if address else self._adapter
+            session = requests.Session()
+            session.proxies.update(self.proxies)
+            session.verify = self.verify
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            sessions[address] = session
+        return session
+    
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._adapter.close()
+        for adapter in self._pinned_adapters.values():
+            adapter.close()
     
-    def _get_headers(self) -> Dict[str, str]:
+    def _get_headers(self, signer: Optional[RequestSigner] = None) -> Dict[str, str]:
         """
         Get headers for API request including authentication.
         
+        Args:
+            signer: Signer to use instead of the client's own credentials
+        
         Returns:
             Dictionary of headers
+            
+        Raises:
+            Exception: If no credentials are available
         """
-        headers = create_auth_headers(self.api_key, self.secret_key)
+        signer = signer or self.signer
+        if signer is None:
+            raise Exception("No credentials configured for request signing")
+        headers = signer.create_auth_headers()
+        headers["Accept-Encoding"] = "gzip, deflate"
         headers.update(self.additional_headers)
         return headers
     
-    def _build_url(self, resource_uri: str) -> str:
+    def _build_url(self, resource_uri: str, base_url: Optional[str] = None) -> str:
         """
         Build full URL from resource URI.
         
         Args:
             resource_uri: Resource URI (relative path)
+            base_url: Endpoint to use instead of the client's base URL
             
         Returns:
             Full URL
         """
         if not resource_uri.startswith('/'):
             resource_uri = '/' + resource_uri
-        return urljoin(self.base_url, resource_uri)
+        return urljoin(base_url or self.base_url, resource_uri)
+    
+    def scheduler_stats(self) -> Optional[dict]:
+        """
+        Get scheduler queue depths and wait times.
+        
+        Returns:
+            Scheduler statistics, or None if no scheduler is configured
+        """
+        return self.scheduler.stats() if self.scheduler else None
+    
+    def endpoint_stats(self) -> List[dict]:
+        """
+        Get health, latency and selection counts for each endpoint.
+        
+        Returns:
+            List of per-endpoint statistics
+        """
+        return self.endpoint_selector.stats()
     
     def _handle_response(self, response: requests.Response, response_class=None) -> Any:
         """
@@ -81,53 +276,153 @@ class KlogsHttpClient:
             return response_class.from_dict(data)
         return data
     
-    def get(self, resource_uri: str, params: Optional[Dict] = None, 
-            response_class=None) -> Any:
+    def _request(self, method: str, resource_uri: str, params: Optional[Dict] = None,
+                 body: Any = None, response_class=None, stream: Optional[bool] = None,
+                 signer: Optional[RequestSigner] = None,
+                 priority: Optional[Priority] = None) -> Any:
         """
-        Send GET request.
+        Send request, waiting for a scheduler slot first if one is configured.
         
         Args:
+            method: HTTP method
             resource_uri: Resource URI
             params: Query parameters
+            body: Request body (will be JSON serialized)
             response_class: Class to deserialize response to
+            stream: Override the client's stream_body setting
+            signer: Signer to use instead of the client's own credentials
+            priority: Scheduling priority (default: Priority.NORMAL)
             
         Returns:
             Response object
+            
+        Raises:
+            QueueFullError: If the scheduler rejects the request
         """
-        url = self._build_url(resource_uri)
-        headers = self._get_headers()
-        
-        response = self.session.get(url, headers=headers, params=params)
-        return self._handle_response(response, response_class)
+        if self.scheduler is None:
+            return self._send(method, resource_uri, params, body, response_class, stream, signer)
+        with self.scheduler.slot(priority or Priority.NORMAL):
+            return self._send(method, resource_uri, params, body, response_class, stream, signer)
     
-    def post(self, resource_uri: str, body: Any = None, 
-             response_class=None) -> Any:
+    def _send(self, method: str, resource_uri: str, params: Optional[Dict], body: Any,
+              response_class, stream: Optional[bool], signer: Optional[RequestSigner]) -> Any:
         """
-        Send POST request.
+        Sign and send request, failing over between endpoints.
         
         Args:
+            method: HTTP method
             resource_uri: Resource URI
+            params: Query parameters
             body: Request body (will be JSON serialized)
             response_class: Class to deserialize response to
+            stream: Override the client's stream_body setting
+            signer: Signer to use instead of the client's own credentials
             
         Returns:
             Response object
         """
-        url = self._build_url(resource_uri)
-        headers = self._get_headers()
+        if stream is None:
+            stream = self.stream_body
+        
+        kwargs = {}
+        if params is not None:
+            kwargs['params'] = params
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
         
-        json_data = None
-        if body is not None:
+        chunked = body is not None and (stream or self.compress_body)
+        if chunked:
+            if not stream:
+                kwargs['data'] = b''.join(
+                    iter_json_chunks(body, self.chunk_size, self.compress_body))
+        elif body is not None:
             if hasattr(body, 'to_dict'):
-                json_data = body.to_dict()
+                kwargs['json'] = body.to_dict()
+            else:
+                kwargs['json'] = body
+        
+        error = None
+        for endpoint in self.endpoint_selector.ordered():
+            # Every attempt gets a fresh nonce and timestamp
+            headers = self._get_headers(signer)
+            if chunked and self.compress_body:
+                headers["Content-Encoding"] = "gzip"
+            if chunked and stream:
+                # A generator is sent chunked and must be recreated per attempt
+                kwargs['data'] = iter_json_chunks(body, self.chunk_size, self.compress_body)
+            
+            url = self._build_url(resource_uri, endpoint.url)
+            start = time.perf_counter()
+            try:
+                session = self._session_for(endpoint.address)
+                response = session.request(method, url, headers=headers, **kwargs)
+            except requests.RequestException as e:
+                self.endpoint_selector.record_failure(endpoint)
+                if self.audit_logger:
+                    self.audit_logger.record(method, resource_uri, body if body is not None else params,
+                                             elapsed=time.perf_counter() - start,
+                                             error=type(e).__name__)
+                if method in IDEMPOTENT_METHODS or _is_connect_failure(e):
+                    error = e
+                    continue
+                raise
+            
+            elapsed = time.perf_counter() - start
+            if self.audit_logger:
+                self.audit_logger.record(method, resource_uri, body if body is not None else params,
+                                         response.status_code, elapsed)
+            if response.status_code >= 500:
+                self.endpoint_selector.record_failure(endpoint, elapsed)
             else:
-                json_data = body
+                self.endpoint_selector.record_success(endpoint, elapsed)
+            return self._handle_response(response, response_class)
         
-        response = self.session.post(url, headers=headers, json=json_data)
-        return self._handle_response(response, response_class)
+        raise error
+    
+    def get(self, resource_uri: str, params: Optional[Dict] = None, 
+            response_class=None, signer: Optional[RequestSigner] = None,
+            priority: Optional[Priority] = None) -> Any:
+        """
+        Send GET request.
+        
+        Args:
+            resource_uri: Resource URI
+            params: Query parameters
+            response_class: Class to deserialize response to
+            signer: Signer to use instead of the client's own credentials
+            priority: Scheduling priority (default: Priority.NORMAL)
+            
+        Returns:
+            Response object
+        """
+        return self._request("GET", resource_uri, params=params,
+                             response_class=response_class, signer=signer, priority=priority)
+    
+    def post(self, resource_uri: str, body: Any = None, 
+             response_class=None, stream: Optional[bool] = None,
+             signer: Optional[RequestSigner] = None,
+             priority: Optional[Priority] = None) -> Any:
+        """
+        Send POST request.
+        
+        Args:
+            resource_uri: Resource URI
+            body: Request body (will be JSON serialized)
+            response_class: Class to deserialize response to
+            stream: Stream the body in chunks (defaults to the client setting)
+            signer: Signer to use instead of the client's own credentials
+            priority: Scheduling priority (default: Priority.NORMAL)
+            
+        Returns:
+            Response object
+        """
+        return self._request("POST", resource_uri, body=body, response_class=response_class,
+                             stream=stream, signer=signer, priority=priority)
     
     def put(self, resource_uri: str, body: Any = None, 
-            response_class=None) -> Any:
+            response_class=None, stream: Optional[bool] = None,
+            signer: Optional[RequestSigner] = None,
+            priority: Optional[Priority] = None) -> Any:
         """
         Send PUT request.
         
@@ -135,36 +430,30 @@ class KlogsHttpClient:
             resource_uri: Resource URI
             body: Request body (will be JSON serialized)
             response_class: Class to deserialize response to
+            stream: Stream the body in chunks (defaults to the client setting)
+            signer: Signer to use instead of the client's own credentials
+            priority: Scheduling priority (default: Priority.NORMAL)
             
         Returns:
             Response object
         """
-        url = self._build_url(resource_uri)
-        headers = self._get_headers()
-        
-        json_data = None
-        if body is not None:
-            if hasattr(body, 'to_dict'):
-                json_data = body.to_dict()
-            else:
-                json_data = body
-        
-        response = self.session.put(url, headers=headers, json=json_data)
-        return self._handle_response(response, response_class)
+        return self._request("PUT", resource_uri, body=body, response_class=response_class,
+                             stream=stream, signer=signer, priority=priority)
     
-    def delete(self, resource_uri: str, response_class=None) -> Any:
+    def delete(self, resource_uri: str, response_class=None,
+               signer: Optional[RequestSigner] = None,
+               priority: Optional[Priority] = None) -> Any:
         """
         Send DELETE request.
         
         Args:
             resource_uri: Resource URI
             response_class: Class to deserialize response to
+            signer: Signer to use instead of the client's own credentials
+            priority: Scheduling priority (default: Priority.NORMAL)
             
         Returns:
             Response object
         """
-        url = self._build_url(resource_uri)
-        headers = self._get_headers()
-        
-        response = self.session.delete(url, headers=headers)
-        return self._handle_response(response, response_class)
+        return self._request("DELETE", resource_uri, response_class=response_class,
+                             signer=signer, priority=priority)
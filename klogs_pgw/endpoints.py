@@ -0,0 +1,314 @@
+"""Klogs Payment Gateway - Endpoint Selection and DNS Caching"""
+
+import ipaddress
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .utils import ShardedCounter
+
+
+# A base URL, or a (base_url, address) tuple pinning it to an IP address
+EndpointSpec = Union[str, Tuple[str, str]]
+
+
+class Endpoint:
+    """Health and latency statistics for one gateway endpoint"""
+
+    def __init__(self, url: str, address: Optional[str] = None):
+        """
+        Initialize endpoint.
+
+        Args:
+            url: Base URL of the endpoint
+            address: IP address to connect to instead of resolving the URL's
+                hostname; the hostname is still used for the Host header,
+                SNI and certificate checks
+        """
+        self.url = url.rstrip('/')
+        self.address = address
+        self.latency = None
+        self.error_rate = 0.0
+        self.error_updated = time.monotonic()
+        self.consecutive_failures = 0
+        self.last_failure = 0.0
+        self.selections = ShardedCounter()
+        self.successes = ShardedCounter()
+        self.failures = ShardedCounter()
+
+    def decayed_error_rate(self, now: float, half_life: float) -> float:
+        """
+        Get the error rate, halved for every ``half_life`` seconds since it
+        was last updated, so an endpoint that stops being used still recovers.
+
+        Args:
+            now: Current monotonic time
+            half_life: Error rate half-life in seconds
+
+        Returns:
+            Error rate between 0 and 1
+        """
+        return self.error_rate * 0.5 ** ((now - self.error_updated) / half_life)
+
+    def score(self, now: float, half_life: float) -> float:
+        """
+        Get the selection score; lower is better.
+
+        Endpoints that have not been measured yet score zero so that they
+        are probed before the measured ones, unless they are failing.
+
+        Args:
+            now: Current monotonic time
+            half_life: Error rate half-life in seconds
+
+        Returns:
+            Error-weighted EWMA latency in seconds
+        """
+        if self.latency is None:
+            return float('inf') if self.consecutive_failures else 0.0
+        return self.latency * (1.0 + 10.0 * self.decayed_error_rate(now, half_life))
+
+
+class EndpointSelector:
+    """
+    Latency-aware selection across several gateway endpoints.
+
+    Failures are forgotten ``eject_seconds`` after the last one, so an
+    ejected or failing endpoint is probed again once that window passes.
+
+    Selection and recording take no locks so that many threads can share
+    one selector. Concurrent EWMA updates may occasionally overwrite each
+    other, which only perturbs the estimates slightly; counts are kept in
+    sharded counters and are exact.
+    """
+
+    def __init__(self, urls: List[EndpointSpec], alpha: float = 0.2,
+                 eject_after: int = 2, eject_seconds: float = 10.0,
+                 error_half_life: float = 30.0):
+        """
+        Initialize endpoint selector.
+
+        Args:
+            urls: Base URLs in order of preference; an entry may also be a
+                (base_url, address) tuple to connect to a fixed IP address
+            alpha: Smoothing factor for the latency and error-rate EWMAs
+            eject_after: Consecutive failures after which an endpoint is
+                taken out of rotation
+            eject_seconds: How long failures count against an endpoint
+            error_half_life: Seconds for an endpoint's error rate to halve
+                when no new requests are recorded for it
+        """
+        if not urls:
+            raise ValueError("At least one endpoint is required")
+        self.endpoints = [Endpoint(*url) if isinstance(url, tuple) else Endpoint(url) for url in urls]
+        self.alpha = alpha
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.error_half_life = error_half_life
+
+    def _expire_failures(self, endpoint: Endpoint, now: float) -> None:
+        if endpoint.consecutive_failures and now - endpoint.last_failure >= self.eject_seconds:
+            endpoint.consecutive_failures = 0
+
+    def is_healthy(self, endpoint: Endpoint, now: float) -> bool:
+        self._expire_failures(endpoint, now)
+        return endpoint.consecutive_failures < self.eject_after
+
+    def ordered(self) -> List[Endpoint]:
+        """
+        Get endpoints in the order they should be tried.
+
+        Healthy endpoints come first, best score first; ejected endpoints
+        follow as a last resort, soonest-recovering first. The first
+        endpoint is counted as selected.
+
+        Returns:
+            List of endpoints
+        """
+        if len(self.endpoints) == 1:
+            self.endpoints[0].selections.add()
+            return self.endpoints
+
+        now = time.monotonic()
+        healthy = [e for e in self.endpoints if self.is_healthy(e, now)]
+        ejected = [e for e in self.endpoints if e not in healthy]
+        healthy.sort(key=lambda e: e.score(now, self.error_half_life))
+        ejected.sort(key=lambda e: e.last_failure)
+        ordered = healthy + ejected
+        ordered[0].selections.add()
+        return ordered
+
+    def _update_error_rate(self, endpoint: Endpoint, sample: float, now: float) -> None:
+        rate = endpoint.decayed_error_rate(now, self.error_half_life)
+        endpoint.error_rate = rate + self.alpha * (sample - rate)
+        endpoint.error_updated = now
+
+    def record_success(self, endpoint: Endpoint, elapsed: float) -> None:
+        """
+        Record a successful request.
+
+        Args:
+            endpoint: Endpoint the request was sent to
+            elapsed: Request latency in seconds
+        """
+        latency = endpoint.latency
+        endpoint.latency = elapsed if latency is None else latency + self.alpha * (elapsed - latency)
+        self._update_error_rate(endpoint, 0.0, time.monotonic())
+        endpoint.consecutive_failures = 0
+        endpoint.successes.add()
+
+    def record_failure(self, endpoint: Endpoint, elapsed: Optional[float] = None) -> None:
+        """
+        Record a failed request.
+
+        Args:
+            endpoint: Endpoint the request was sent to
+            elapsed: Time spent before the failure, if known
+        """
+        now = time.monotonic()
+        if elapsed is not None:
+            latency = endpoint.latency
+            endpoint.latency = elapsed if latency is None else latency + self.alpha * (elapsed - latency)
+        self._update_error_rate(endpoint, 1.0, now)
+        self._expire_failures(endpoint, now)
+        endpoint.consecutive_failures += 1
+        endpoint.last_failure = now
+        endpoint.failures.add()
+
+    def stats(self) -> List[dict]:
+        """
+        Get endpoint health and selection counts.
+
+        Returns:
+            List of per-endpoint statistics
+        """
+        now = time.monotonic()
+        return [{
+            "url": e.url,
+            "address": e.address,
+            "latency": e.latency,
+            "errorRate": e.decayed_error_rate(now, self.error_half_life),
+            "consecutiveFailures": e.consecutive_failures,
+            "healthy": self.is_healthy(e, now),
+            "selections": e.selections.value,
+            "successes": e.successes.value,
+            "failures": e.failures.value
+        } for e in self.endpoints]
+
+
+class DnsCache:
+    """In-process DNS cache with a fixed TTL"""
+
+    def __init__(self, ttl: float = 60.0):
+        """
+        Initialize DNS cache.
+
+        Args:
+            ttl: Seconds a resolved address is reused before resolving again
+        """
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> str:
+        """
+        Resolve a hostname to an IP address, using the cache when fresh.
+
+        A stale entry is served if resolution fails, so a DNS outage does not
+        take down an otherwise reachable gateway.
+
+        Args:
+            host: Hostname or IP literal
+            port: Port the connection will use
+
+        Returns:
+            IP address to connect to
+        """
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            if entry is not None:
+                return entry[0]
+            raise
+        address = infos[0][4][0]
+        with self._lock:
+            self._entries[key] = (address, now + self.ttl)
+        return address
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class PinnedAddress:
+    """Resolver that sends every connection to one fixed IP address"""
+
+    def __init__(self, address: str):
+        """
+        Initialize resolver.
+
+        Args:
+            address: IP address to connect to
+        """
+        self.address = address
+
+    def resolve(self, host: str, port: int) -> str:
+        return self.address
+
+
+def _cached_connection_class(base, dns_cache):
+    def _new_conn(self):
+        # Connect to the resolved address while leaving ``host`` (used for
+        # the Host header, SNI and certificate checks) untouched afterwards.
+        host = self._dns_host
+        self._dns_host = dns_cache.resolve(host, self.port)
+        try:
+            return base._new_conn(self)
+        finally:
+            self._dns_host = host
+
+    return type('DnsCached' + base.__name__, (base,), {'_new_conn': _new_conn})
+
+
+class DnsCachingAdapter(HTTPAdapter):
+    """requests adapter that resolves hostnames through a DnsCache or PinnedAddress"""
+
+    def __init__(self, dns_cache, **kwargs):
+        """
+        Initialize adapter.
+
+        Args:
+            dns_cache: DnsCache or PinnedAddress used for new connections
+            **kwargs: Passed through to HTTPAdapter
+        """
+        self.dns_cache = dns_cache
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type('DnsCachedHTTPConnectionPool', (HTTPConnectionPool,), {
+                'ConnectionCls': _cached_connection_class(HTTPConnection, self.dns_cache)
+            }),
+            'https': type('DnsCachedHTTPSConnectionPool', (HTTPSConnectionPool,), {
+                'ConnectionCls': _cached_connection_class(HTTPSConnection, self.dns_cache)
+            })
+        }
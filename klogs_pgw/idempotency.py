@@ -0,0 +1,354 @@
+"""Klogs Payment Gateway - Idempotency Registry"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+class SqliteIdempotencyStore:
+    """
+    SQLite-backed outcome store shared by worker processes on one host.
+
+    A key is either ``pending`` (claimed by a process that is calling the
+    gateway, with a lease the process keeps renewing) or ``done`` with the
+    serialized outcome. A pending key whose lease has run out belongs to a
+    process that stopped mid-call; since the gateway may or may not have
+    processed that call, the key is not handed to another caller until it is
+    released after reconciliation.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize store, creating the table if needed.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS klogs_idempotency ("
+                "key TEXT PRIMARY KEY, state TEXT NOT NULL, payload TEXT, expires REAL NOT NULL, "
+                "fingerprint TEXT)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Get a completed outcome.
+
+        Args:
+            key: Idempotency key
+
+        Returns:
+            Serialized outcome, or None if there is no unexpired outcome
+        """
+        row = self._connect().execute(
+            "SELECT payload FROM klogs_idempotency WHERE key = ? AND state = 'done' AND expires > ?",
+            (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def fingerprint(self, key: str) -> Optional[str]:
+        """
+        Get the request fingerprint stored with a pending or completed key.
+
+        Args:
+            key: Idempotency key
+
+        Returns:
+            Fingerprint, or None if the key is unknown or has none
+        """
+        row = self._connect().execute(
+            "SELECT fingerprint FROM klogs_idempotency WHERE key = ? AND (state = 'pending' OR expires > ?)",
+            (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def claim(self, key: str, lease: float, fingerprint: Optional[str] = None) -> bool:
+        """
+        Claim a key for this process.
+
+        Args:
+            key: Idempotency key
+            lease: Seconds the claim is held unless renewed
+            fingerprint: Summary of the request, checked against later
+                requests using the same key
+
+        Returns:
+            True if the key was claimed, False if another process holds or
+            abandoned it or an outcome is already stored
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM klogs_idempotency WHERE key = ? AND state = 'done' AND expires <= ?",
+                (key, now)
+            )
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO klogs_idempotency (key, state, payload, expires, fingerprint) "
+                "VALUES (?, 'pending', NULL, ?, ?)",
+                (key, now + lease, fingerprint)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount == 1
+
+    def renew(self, key: str, lease: float) -> None:
+        """
+        Extend the lease of a claim held by this process.
+
+        Args:
+            key: Idempotency key
+            lease: Seconds from now the claim is held for
+        """
+        self._connect().execute(
+            "UPDATE klogs_idempotency SET expires = ? WHERE key = ? AND state = 'pending'",
+            (time.time() + lease, key)
+        )
+
+    def is_abandoned(self, key: str) -> bool:
+        """
+        Check whether a claim's lease ran out before its outcome was stored.
+
+        Args:
+            key: Idempotency key
+
+        Returns:
+            True if the key is pending with an expired lease
+        """
+        row = self._connect().execute(
+            "SELECT 1 FROM klogs_idempotency WHERE key = ? AND state = 'pending' AND expires <= ?",
+            (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def complete(self, key: str, payload: dict, ttl: float,
+                 fingerprint: Optional[str] = None) -> None:
+        """
+        Store a completed outcome.
+
+        Args:
+            key: Idempotency key
+            payload: Serialized outcome
+            ttl: Seconds the outcome is served for
+            fingerprint: Summary of the request that produced the outcome
+        """
+        self._connect().execute(
+            "INSERT OR REPLACE INTO klogs_idempotency (key, state, payload, expires, fingerprint) "
+            "VALUES (?, 'done', ?, ?, ?)",
+            (key, json.dumps(payload), time.time() + ttl, fingerprint)
+        )
+
+    def release(self, key: str) -> None:
+        """
+        Drop an unfinished or abandoned claim so another caller can retry.
+
+        Args:
+            key: Idempotency key
+        """
+        self._connect().execute(
+            "DELETE FROM klogs_idempotency WHERE key = ? AND state = 'pending'", (key,)
+        )
+
+
+class _InFlight:
+    def __init__(self, fingerprint: Optional[str]):
+        self.fingerprint = fingerprint
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class IdempotencyRegistry:
+    """
+    Deduplicates concurrent and repeated calls sharing an idempotency key.
+
+    Concurrent callers with the same key share a single in-flight call and
+    its result or exception. Completed outcomes are served from a bounded
+    TTL cache; failed calls are not cached so they can be retried. A call
+    whose fingerprint differs from the one stored for its key is rejected
+    rather than given another request's outcome.
+
+    With a store, a claimed key's lease is renewed by a background thread
+    for as long as the call runs, so a slow gateway call is never taken over
+    by another process.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 10000,
+                 store: Optional[SqliteIdempotencyStore] = None,
+                 wait_timeout: float = 120.0, poll_interval: float = 0.05,
+                 lease: float = 30.0, max_in_flight: int = 10000):
+        """
+        Initialize registry.
+
+        Args:
+            ttl: Seconds a completed outcome is served from the cache
+            max_entries: Maximum number of outcomes kept in memory
+            store: Optional store shared across worker processes
+            wait_timeout: Seconds to wait for another caller's in-flight call
+            poll_interval: Seconds between store checks while another
+                process holds the key
+            lease: Seconds a store claim is held between renewals; a claim
+                whose process stops renewing it is reported as abandoned
+            max_in_flight: Maximum number of keys being called at once
+        """
+        if lease <= 0:
+            raise ValueError("lease must be positive")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.store = store
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.max_in_flight = max_in_flight
+        self._outcomes = OrderedDict()
+        self._in_flight = {}
+        self._held = set()
+        self._renewer = None
+        self._lock = threading.Lock()
+
+    def run(self, key: str, func: Callable[[], Any], response_class,
+            fingerprint: Optional[str] = None) -> Any:
+        """
+        Call ``func`` once per key, sharing its outcome with other callers.
+
+        Args:
+            key: Idempotency key
+            func: Callable performing the request
+            response_class: Class used to rebuild outcomes loaded from the
+                store (must provide from_dict; results must provide to_dict)
+            fingerprint: Summary of the request (e.g. amount and currency);
+                a different fingerprint for a known key raises
+
+        Returns:
+            Result of ``func`` for this key
+
+        Raises:
+            Exception: If waiting for another caller's call times out, too
+                many calls are in flight, the key was used for a request
+                with a different fingerprint, or another process abandoned
+                the key mid-call so its outcome is unknown
+        """
+        with self._lock:
+            outcome = self._outcomes.get(key)
+            if outcome is not None:
+                if outcome[1] > time.monotonic():
+                    self._check_fingerprint(key, outcome[2], fingerprint)
+                    self._outcomes.move_to_end(key)
+                    return outcome[0]
+                del self._outcomes[key]
+
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                if len(self._in_flight) >= self.max_in_flight:
+                    raise Exception(f"Too many in-flight idempotent requests: {len(self._in_flight)}")
+                flight = self._in_flight[key] = _InFlight(fingerprint)
+            else:
+                self._check_fingerprint(key, flight.fingerprint, fingerprint)
+
+        if not leader:
+            if not flight.event.wait(self.wait_timeout):
+                raise Exception(f"Timed out waiting for in-flight request: {key}")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            if self.store:
+                flight.result = self._run_with_store(key, func, response_class, fingerprint)
+            else:
+                flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            self._remember(key, flight.result, fingerprint)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.event.set()
+        return flight.result
+
+    @staticmethod
+    def _check_fingerprint(key: str, stored: Optional[str], fingerprint: Optional[str]) -> None:
+        if stored is not None and fingerprint is not None and stored != fingerprint:
+            raise Exception(f"Idempotency key reused for a different request: {key}")
+
+    def _run_with_store(self, key: str, func: Callable[[], Any], response_class,
+                        fingerprint: Optional[str]) -> Any:
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            if fingerprint is not None:
+                self._check_fingerprint(key, self.store.fingerprint(key), fingerprint)
+            payload = self.store.get(key)
+            if payload is not None:
+                return response_class.from_dict(payload)
+            if self.store.claim(key, self.lease, fingerprint):
+                break
+            if self.store.is_abandoned(key):
+                raise Exception(
+                    f"Outcome unknown for request {key}: the process sending it stopped "
+                    f"before storing the result; reconcile it, then release the key"
+                )
+            if time.monotonic() >= deadline:
+                raise Exception(f"Timed out waiting for in-flight request: {key}")
+            time.sleep(self.poll_interval)
+
+        self._hold(key)
+        try:
+            result = func()
+        except BaseException:
+            self._unhold(key)
+            self.store.release(key)
+            raise
+        self._unhold(key)
+        self.store.complete(key, result.to_dict(), self.ttl, fingerprint)
+        return result
+
+    def _hold(self, key: str) -> None:
+        with self._lock:
+            self._held.add(key)
+            if self._renewer is None:
+                self._renewer = threading.Thread(target=self._renew_leases,
+                                                 name='klogs-idempotency-lease', daemon=True)
+                self._renewer.start()
+
+    def _unhold(self, key: str) -> None:
+        with self._lock:
+            self._held.discard(key)
+
+    def _renew_leases(self) -> None:
+        # Renew well within the lease so a slow renewal does not let it lapse
+        while True:
+            time.sleep(self.lease / 3)
+            with self._lock:
+                keys = list(self._held)
+            for key in keys:
+                try:
+                    self.store.renew(key, self.lease)
+                except sqlite3.Error:
+                    pass
+
+    def _remember(self, key: str, result: Any, fingerprint: Optional[str]) -> None:
+        with self._lock:
+            self._outcomes[key] = (result, time.monotonic() + self.ttl, fingerprint)
+            self._outcomes.move_to_end(key)
+            while len(self._outcomes) > self.max_entries:
+                self._outcomes.popitem(last=False)
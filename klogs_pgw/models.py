@@ -121,31 +121,51 @@ class CreatePaymentRequest:
     national_number: Optional[str] = None
     products: Optional[List[Product]] = None
 
+    def iter_items(self):
+        """
+        Yield the JSON fields of the request, skipping None values.
+
+        Nested models and the products list are yielded unserialized so that
+        callers can encode them lazily.
+
+        Yields:
+            (key, value) pairs in wire order
+        """
+        items = (
+            ("token", self.token),
+            ("amount", self.amount),
+            ("installment", self.installment),
+            ("referenceCode", self.reference_code),
+            ("useStoredCard", self.use_stored_card),
+            ("card", self.card),
+            ("reward", self.reward),
+            ("invoice", self.invoice),
+            ("shipping", self.shipping),
+            ("explanation", self.explanation),
+            ("use3d", self.use_3d),
+            ("additionalData", self.additional_data),
+            ("currency", self.currency),
+            ("email", self.email),
+            ("phone", self.phone),
+            ("returnURL", self.return_url),
+            ("chargeType", self.charge_type.value if self.charge_type else None),
+            ("paymentSystemId", self.payment_system_id),
+            ("nationalNumber", self.national_number),
+            ("products", self.products if self.products else None)
+        )
+        for key, value in items:
+            if value is not None:
+                yield key, value
+
     def to_dict(self):
-        data = {
-            "token": self.token,
-            "amount": self.amount,
-            "installment": self.installment,
-            "referenceCode": self.reference_code,
-            "useStoredCard": self.use_stored_card,
-            "card": self.card.to_dict() if self.card else None,
-            "reward": self.reward.to_dict() if self.reward else None,
-            "invoice": self.invoice.to_dict() if self.invoice else None,
-            "shipping": self.shipping.to_dict() if self.shipping else None,
-            "explanation": self.explanation,
-            "use3d": self.use_3d,
-            "additionalData": self.additional_data,
-            "currency": self.currency,
-            "email": self.email,
-            "phone": self.phone,
-            "returnURL": self.return_url,
-            "chargeType": self.charge_type.value if self.charge_type else None,
-            "paymentSystemId": self.payment_system_id,
-            "nationalNumber": self.national_number,
-            "products": [p.to_dict() for p in self.products] if self.products else None
-        }
-        # Remove None values
-        return {k: v for k, v in data.items() if v is not None}
+        data = {}
+        for key, value in self.iter_items():
+            if key == "products":
+                value = [p.to_dict() for p in value]
+            elif hasattr(value, "to_dict"):
+                value = value.to_dict()
+            data[key] = value
+        return data
 
 
 @dataclass
@@ -157,6 +177,9 @@ class Error:
     def from_dict(cls, data: dict):
         return cls(summary=data.get("summary"))
 
+    def to_dict(self):
+        return {"summary": self.summary}
+
 
 @dataclass
 class Response:
@@ -166,10 +189,21 @@ class Response:
 
     @classmethod
     def from_dict(cls, data: dict):
-        return cls(
-            success=data.get("success", False),
-            error=Error.from_dict(data.get("error", {})) if data.get("error") else None
-        )
+        return cls(**Response._base_fields(data))
+
+    @staticmethod
+    def _base_fields(data: dict) -> dict:
+        error = data.get("error")
+        return {
+            "success": data.get("success", False),
+            "error": Error.from_dict(error) if error else None
+        }
+
+    def to_dict(self):
+        return {
+            "success": self.success,
+            "error": self.error.to_dict() if self.error else None
+        }
 
 
 @dataclass
@@ -180,14 +214,18 @@ class CardPaymentResponse(Response):
 
     @classmethod
     def from_dict(cls, data: dict):
-        base = Response.from_dict(data)
         return cls(
-            success=base.success,
-            error=base.error,
+            **Response._base_fields(data),
             behavior=data.get("behavior"),
             link=data.get("link")
         )
 
+    def to_dict(self):
+        data = super().to_dict()
+        data["behavior"] = self.behavior
+        data["link"] = self.link
+        return data
+
 
 @dataclass
 class PaymentTokenResponse(Response):
@@ -196,13 +234,16 @@ class PaymentTokenResponse(Response):
 
     @classmethod
     def from_dict(cls, data: dict):
-        base = Response.from_dict(data)
         return cls(
-            success=base.success,
-            error=base.error,
+            **Response._base_fields(data),
             token=data.get("token")
         )
 
+    def to_dict(self):
+        data = super().to_dict()
+        data["token"] = self.token
+        return data
+
 
 @dataclass
 class ProvisionCommitRequest:
@@ -240,9 +281,12 @@ class CommissionResponse(Response):
 
     @classmethod
     def from_dict(cls, data: dict):
-        base = Response.from_dict(data)
         return cls(
-            success=base.success,
-            error=base.error,
+            **Response._base_fields(data),
             installments=data.get("installments")
         )
+
+    def to_dict(self):
+        data = super().to_dict()
+        data["installments"] = self.installments
+        return data
@@ -0,0 +1,221 @@
+"""Klogs Payment Gateway - Multi-Tenant Client"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .audit import AuditLogger
+from .client import KlogsHttpClient
+from .endpoints import EndpointSpec
+from .idempotency import IdempotencyRegistry
+from .scheduler import RequestScheduler
+from .services.card_payment import CardPaymentService
+from .utils import RequestSigner
+
+
+CredentialProvider = Callable[[str], Optional[Tuple[str, str]]]
+
+
+class TenantHttpClient:
+    """HTTP client view that signs every request with one merchant's credentials"""
+
+    def __init__(self, transport: KlogsHttpClient, signer: RequestSigner):
+        """
+        Initialize tenant view.
+
+        Args:
+            transport: Shared HTTP client
+            signer: Signer for the merchant's credentials
+        """
+        self.transport = transport
+        self.signer = signer
+
+    def get(self, *args, **kwargs) -> Any:
+        return self.transport.get(*args, signer=self.signer, **kwargs)
+
+    def post(self, *args, **kwargs) -> Any:
+        return self.transport.post(*args, signer=self.signer, **kwargs)
+
+    def put(self, *args, **kwargs) -> Any:
+        return self.transport.put(*args, signer=self.signer, **kwargs)
+
+    def delete(self, *args, **kwargs) -> Any:
+        return self.transport.delete(*args, signer=self.signer, **kwargs)
+
+
+class MerchantClient:
+    """Services bound to a single merchant of a MultiTenantKlogsClient"""
+
+    def __init__(self, http_client: TenantHttpClient,
+                 idempotency_registry: Optional[IdempotencyRegistry] = None,
+                 merchant_id: Optional[str] = None):
+        """
+        Initialize merchant client.
+
+        Args:
+            http_client: Tenant HTTP client view
+            idempotency_registry: Registry deduplicating pay() calls
+            merchant_id: Merchant identifier scoping idempotency keys
+        """
+        self._card_payment = CardPaymentService(http_client, idempotency_registry, merchant_id)
+
+    @property
+    def card_payment(self) -> CardPaymentService:
+        """
+        Get card payment service.
+
+        Returns:
+            CardPaymentService instance
+        """
+        return self._card_payment
+
+
+class MultiTenantKlogsClient:
+    """Klogs client serving many merchants over one shared connection pool"""
+
+    def __init__(self, base_url: str = "https://pgw.klogs.io",
+                 credentials: Optional[Dict[str, Tuple[str, str]]] = None,
+                 credential_provider: Optional[CredentialProvider] = None,
+                 max_signers: int = 1024,
+                 additional_headers: Optional[Dict[str, str]] = None,
+                 stream_body: bool = False, compress_body: bool = False,
+                 endpoints: Optional[List[EndpointSpec]] = None,
+                 dns_ttl: Optional[float] = None,
+                 timeout: Optional[Union[float, Tuple[float, float]]] = None,
+                 audit_logger: Optional[AuditLogger] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 pool_size: int = 10,
+                 proxies: Optional[Dict[str, str]] = None,
+                 verify: Union[bool, str] = True,
+                 idempotency_registry: Optional[IdempotencyRegistry] = None):
+        """
+        Initialize multi-tenant client.
+
+        Args:
+            base_url: Base URL for the API (default: https://pgw.klogs.io)
+            credentials: Mapping of merchant id to (api_key, secret_key)
+            credential_provider: Callable returning (api_key, secret_key) for
+                merchant ids not found in ``credentials``
+            max_signers: Number of pre-keyed signers kept in the LRU cache
+            additional_headers: Additional headers to include in all requests
+            stream_body: Stream request bodies with chunked transfer encoding
+            compress_body: Gzip-compress request bodies
+            endpoints: Additional base URLs, or (base_url, address) tuples
+                pinned to an IP address, to fail over to
+            dns_ttl: Cache DNS lookups in-process for this many seconds
+            timeout: Request timeout, as seconds or (connect, read)
+            audit_logger: Audit log that every gateway call is recorded to
+            scheduler: Scheduler limiting concurrent requests by priority
+            pool_size: Maximum connections kept open to the gateway
+            proxies: Proxy URLs by scheme
+            verify: TLS verification flag or CA bundle path
+            idempotency_registry: Registry deduplicating pay() calls; keys
+                are scoped per merchant, so merchants may reuse reference codes
+
+        Example:
+            >>> client = MultiTenantKlogsClient(
+            ...     credentials={"merchant-1": ("api-key", "secret-key")}
+            ... )
+            >>> response = client.merchant("merchant-1").card_payment.pay(payment_request)
+        """
+        self._http_client = KlogsHttpClient(
+            base_url=base_url,
+            additional_headers=additional_headers,
+            stream_body=stream_body,
+            compress_body=compress_body,
+            endpoints=endpoints,
+            dns_ttl=dns_ttl,
+            timeout=timeout,
+            audit_logger=audit_logger,
+            scheduler=scheduler,
+            pool_size=pool_size,
+            proxies=proxies,
+            verify=verify
+        )
+        self._credentials = dict(credentials or {})
+        self._credential_provider = credential_provider
+        self._max_signers = max_signers
+        self._idempotency_registry = idempotency_registry
+        self._signers = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def http_client(self) -> KlogsHttpClient:
+        """
+        Get the shared HTTP client.
+
+        Returns:
+            KlogsHttpClient instance
+        """
+        return self._http_client
+
+    def register_merchant(self, merchant_id: str, api_key: str, secret_key: str) -> None:
+        """
+        Add or replace a merchant's credentials.
+
+        Args:
+            merchant_id: Merchant identifier
+            api_key: API key for the merchant
+            secret_key: Secret key for the merchant
+        """
+        with self._lock:
+            self._credentials[merchant_id] = (api_key, secret_key)
+            self._signers.pop(merchant_id, None)
+
+    def remove_merchant(self, merchant_id: str) -> None:
+        """
+        Forget a merchant's credentials and cached signer.
+
+        Args:
+            merchant_id: Merchant identifier
+        """
+        with self._lock:
+            self._credentials.pop(merchant_id, None)
+            self._signers.pop(merchant_id, None)
+
+    def _get_signer(self, merchant_id: str) -> RequestSigner:
+        """
+        Get the pre-keyed signer for a merchant, creating it on a cache miss.
+
+        Args:
+            merchant_id: Merchant identifier
+
+        Returns:
+            RequestSigner instance
+
+        Raises:
+            Exception: If no credentials are known for the merchant
+        """
+        with self._lock:
+            signer = self._signers.get(merchant_id)
+            if signer is not None:
+                self._signers.move_to_end(merchant_id)
+                return signer
+            credentials = self._credentials.get(merchant_id)
+
+        if credentials is None and self._credential_provider:
+            credentials = self._credential_provider(merchant_id)
+        if credentials is None:
+            raise Exception(f"Unknown merchant: {merchant_id}")
+
+        signer = RequestSigner(*credentials)
+        with self._lock:
+            self._signers[merchant_id] = signer
+            self._signers.move_to_end(merchant_id)
+            while len(self._signers) > self._max_signers:
+                self._signers.popitem(last=False)
+        return signer
+
+    def merchant(self, merchant_id: str) -> MerchantClient:
+        """
+        Get services bound to a merchant's credentials.
+
+        Args:
+            merchant_id: Merchant identifier
+
+        Returns:
+            MerchantClient instance
+        """
+        signer = self._get_signer(merchant_id)
+        return MerchantClient(TenantHttpClient(self._http_client, signer),
+                              self._idempotency_registry, merchant_id)
@@ -0,0 +1,180 @@
+"""Klogs Payment Gateway - Priority Request Scheduler"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import Enum
+from typing import Dict, Optional
+
+
+class Priority(str, Enum):
+    """Request priority class"""
+    CRITICAL = "critical"
+    NORMAL = "normal"
+    BACKGROUND = "background"
+
+
+class QueueFullError(Exception):
+    """Raised when a request is rejected because its priority queue is full"""
+
+
+DEFAULT_QUEUE_LIMITS = {
+    Priority.CRITICAL: 1000,
+    Priority.NORMAL: 200,
+    Priority.BACKGROUND: 50
+}
+
+DEFAULT_WEIGHTS = {
+    Priority.CRITICAL: 8,
+    Priority.NORMAL: 3,
+    Priority.BACKGROUND: 1
+}
+
+
+class _Waiter:
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class _ClassStats:
+    def __init__(self):
+        self.dispatched = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class RequestScheduler:
+    """
+    Limits concurrent gateway requests and orders waiting ones by priority.
+
+    Each priority class has a bounded FIFO queue. When a slot frees up the
+    next waiter is picked by smooth weighted round-robin across the
+    non-empty queues, so higher classes get proportionally more slots
+    without starving lower ones. A request whose queue is full is rejected
+    immediately with QueueFullError.
+    """
+
+    def __init__(self, max_concurrency: int = 10,
+                 queue_limits: Optional[Dict[Priority, int]] = None,
+                 weights: Optional[Dict[Priority, int]] = None,
+                 wait_timeout: Optional[float] = None):
+        """
+        Initialize scheduler.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight (usually
+                the connection pool size)
+            queue_limits: Maximum queued requests per priority class
+            weights: Relative share of freed slots per priority class
+            wait_timeout: Maximum seconds a request waits for a slot
+        """
+        self.max_concurrency = max_concurrency
+        self.queue_limits = dict(DEFAULT_QUEUE_LIMITS, **(queue_limits or {}))
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.wait_timeout = wait_timeout
+        self._active = 0
+        self._queues = {priority: deque() for priority in Priority}
+        self._current = {priority: 0 for priority in Priority}
+        self._stats = {priority: _ClassStats() for priority in Priority}
+        self._lock = threading.Lock()
+
+    def acquire(self, priority: Priority = Priority.NORMAL) -> None:
+        """
+        Wait for a request slot.
+
+        Args:
+            priority: Priority class of the request
+
+        Raises:
+            QueueFullError: If the priority class queue is full
+            Exception: If no slot became available within wait_timeout
+        """
+        start = time.monotonic()
+        with self._lock:
+            if self._active < self.max_concurrency and not any(self._queues.values()):
+                self._active += 1
+                self._stats[priority].dispatched += 1
+                return
+            queue = self._queues[priority]
+            if len(queue) >= self.queue_limits[priority]:
+                self._stats[priority].rejected += 1
+                raise QueueFullError(f"Request queue full for priority: {priority.value}")
+            waiter = _Waiter()
+            queue.append(waiter)
+
+        waiter.event.wait(self.wait_timeout)
+
+        with self._lock:
+            stats = self._stats[priority]
+            if not waiter.granted:
+                self._queues[priority].remove(waiter)
+                stats.timed_out += 1
+                raise Exception(f"Timed out waiting for a request slot: {priority.value}")
+            wait = time.monotonic() - start
+            stats.dispatched += 1
+            stats.total_wait += wait
+            stats.max_wait = max(stats.max_wait, wait)
+
+    def release(self) -> None:
+        """Free a request slot, handing it to the next waiter if any."""
+        with self._lock:
+            waiter = self._next_waiter()
+            if waiter is None:
+                self._active -= 1
+                return
+            # The slot passes straight to the waiter; _active is unchanged
+            waiter.granted = True
+            waiter.event.set()
+
+    @contextmanager
+    def slot(self, priority: Priority = Priority.NORMAL):
+        """
+        Hold a request slot for the duration of a with-block.
+
+        Args:
+            priority: Priority class of the request
+        """
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        # Smooth weighted round-robin over the non-empty queues
+        candidates = [p for p in Priority if self._queues[p]]
+        if not candidates:
+            return None
+        total = 0
+        for priority in candidates:
+            self._current[priority] += self.weights[priority]
+            total += self.weights[priority]
+        chosen = max(candidates, key=lambda p: self._current[p])
+        self._current[chosen] -= total
+        return self._queues[chosen].popleft()
+
+    def stats(self) -> dict:
+        """
+        Get queue depths, wait times and dispatch counts.
+
+        Returns:
+            Dictionary of scheduler statistics
+        """
+        with self._lock:
+            classes = {}
+            for priority in Priority:
+                stats = self._stats[priority]
+                classes[priority.value] = {
+                    "queued": len(self._queues[priority]),
+                    "queueLimit": self.queue_limits[priority],
+                    "dispatched": stats.dispatched,
+                    "rejected": stats.rejected,
+                    "timedOut": stats.timed_out,
+                    "averageWait": stats.total_wait / stats.dispatched if stats.dispatched else 0.0,
+                    "maxWait": stats.max_wait
+                }
+            return {"active": self._active, "classes": classes}
@@ -1,6 +1,6 @@
 """Klogs Payment Gateway - Card Payment Service"""
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from ..models import (
     CardPaymentResponse,
@@ -11,57 +11,90 @@ from ..models import (
     CommissionResponse,
     Response
 )
+from ..scheduler import Priority
 
 if TYPE_CHECKING:
     from ..client import KlogsHttpClient
+    from ..idempotency import IdempotencyRegistry
 
 
 class CardPaymentService:
     """Card Payment service client"""
     
-    def __init__(self, http_client: 'KlogsHttpClient'):
+    def __init__(self, http_client: 'KlogsHttpClient',
+                 idempotency_registry: Optional['IdempotencyRegistry'] = None,
+                 idempotency_scope: Optional[str] = None):
         """
         Initialize card payment service.
         
         Args:
             http_client: HTTP client instance
+            idempotency_registry: Registry deduplicating pay() calls that
+                share a reference code
+            idempotency_scope: Prefix for idempotency keys (e.g. a merchant
+                id) so services sharing a registry never share outcomes
         """
         self.http = http_client
+        self.idempotency_registry = idempotency_registry
+        self.idempotency_scope = idempotency_scope
     
-    def pay(self, request: CreatePaymentRequest) -> CardPaymentResponse:
+    def pay(self, request: CreatePaymentRequest,
+            priority: Priority = Priority.CRITICAL) -> CardPaymentResponse:
         """
         Process a card payment.
         
+        When an idempotency registry is configured, concurrent or repeated
+        calls with the same reference code share a single gateway call. A
+        call reusing a reference code with a different amount, currency or
+        installment count raises instead.
+        
         Args:
             request: Payment request data
+            priority: Scheduling priority (default: Priority.CRITICAL)
             
         Returns:
             Card payment response
         """
-        return self.http.post(
-            "/api/cardPayment",
-            body=request,
-            response_class=CardPaymentResponse
-        )
+        def send():
+            return self.http.post(
+                "/api/cardPayment",
+                body=request,
+                response_class=CardPaymentResponse,
+                priority=priority
+            )
+        
+        if self.idempotency_registry and request.reference_code:
+            key = request.reference_code
+            if self.idempotency_scope:
+                key = f"{self.idempotency_scope}:{key}"
+            fingerprint = f"{request.amount}|{request.currency}|{request.installment}"
+            return self.idempotency_registry.run(key, send, CardPaymentResponse, fingerprint)
+        return send()
     
-    def create_payment_token(self) -> PaymentTokenResponse:
+    def create_payment_token(self, priority: Priority = Priority.NORMAL) -> PaymentTokenResponse:
         """
         Create a payment token.
         
+        Args:
+            priority: Scheduling priority (default: Priority.NORMAL)
+        
         Returns:
             Payment token response
         """
         return self.http.get(
             "/api/cardPayment/token",
-            response_class=PaymentTokenResponse
+            response_class=PaymentTokenResponse,
+            priority=priority
         )
     
-    def provision_commit(self, request: ProvisionCommitRequest) -> Response:
+    def provision_commit(self, request: ProvisionCommitRequest,
+                         priority: Priority = Priority.CRITICAL) -> Response:
         """
         Commit a provision.
         
         Args:
             request: Provision commit request
+            priority: Scheduling priority (default: Priority.CRITICAL)
             
         Returns:
             Response
@@ -69,15 +102,18 @@ class CardPaymentService:
         return self.http.post(
             "/api/cardPayment/provisionCommit",
             body=request,
-            response_class=Response
+            response_class=Response,
+            priority=priority
         )
     
-    def get_commissions_by_bin(self, request: CommissionsRequest) -> CommissionResponse:
+    def get_commissions_by_bin(self, request: CommissionsRequest,
+                               priority: Priority = Priority.BACKGROUND) -> CommissionResponse:
         """
         Get commissions by BIN number.
         
         Args:
             request: Commissions request
+            priority: Scheduling priority (default: Priority.BACKGROUND)
             
         Returns:
             Commission response
@@ -93,5 +129,6 @@ class CardPaymentService:
         return self.http.get(
             "/api/cardPayment/installments",
             params=params,
-            response_class=CommissionResponse
+            response_class=CommissionResponse,
+            priority=priority
         )
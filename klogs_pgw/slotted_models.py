@@ -0,0 +1,274 @@
+"""Klogs Payment Gateway Python Client - Slotted Models
+
+Memory-light variants of the classes in ``klogs_pgw.models`` for holding
+large numbers of objects (bulk imports, reconciliation). Instances use
+``__slots__`` instead of a per-instance ``__dict__``, and ``__init__``,
+``to_dict`` and ``from_dict`` are generated once per class as straight-line
+code. The wire format is identical to the regular models.
+
+Each model has a mutable variant with the same name and an immutable,
+hashable variant prefixed with ``Frozen`` (e.g. ``FrozenProduct``). Frozen
+instances store list fields as tuples and dict fields as read-only
+mappings; ``to_dict`` still returns plain lists and dictionaries.
+"""
+
+import dataclasses
+import typing
+from collections.abc import Mapping
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Dict, Tuple
+
+from . import models
+
+
+# Wire names that are not the plain camelCase form of the field name
+_JSON_NAMES = {
+    "use_3d": "use3d",
+    "return_url": "returnURL"
+}
+
+# Models whose to_dict omits None values
+_DROP_NONE = frozenset([models.CreatePaymentRequest, models.ProvisionCommitRequest])
+
+_cache: Dict[Tuple[type, bool], type] = {}
+
+
+def _json_name(name: str) -> str:
+    if name in _JSON_NAMES:
+        return _JSON_NAMES[name]
+    head, *rest = name.split('_')
+    return head + ''.join(part.capitalize() for part in rest)
+
+
+def _field_kind(tp):
+    """
+    Classify a field type annotation.
+
+    Returns:
+        ("model", cls), ("list", cls), ("enum", cls) or ("value", None)
+    """
+    if getattr(tp, '__origin__', None) is typing.Union:
+        args = [arg for arg in tp.__args__ if arg is not type(None)]
+        if len(args) == 1:
+            tp = args[0]
+    if getattr(tp, '__origin__', None) in (list, typing.List):
+        item = tp.__args__[0]
+        if dataclasses.is_dataclass(item):
+            return "list", item
+        return "value", None
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return "enum", tp
+    if dataclasses.is_dataclass(tp):
+        return "model", tp
+    return "value", None
+
+
+def _is_container(tp) -> bool:
+    if getattr(tp, '__origin__', None) is typing.Union:
+        args = [arg for arg in tp.__args__ if arg is not type(None)]
+        if len(args) == 1:
+            tp = args[0]
+    return getattr(tp, '__origin__', None) in (list, dict, typing.List, typing.Dict)
+
+
+def _freeze(value: Any) -> Any:
+    """Copy lists to tuples and dicts to read-only mappings, recursively."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of _freeze, producing plain lists and dictionaries."""
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    return value
+
+
+def _hash_key(value: Any) -> Any:
+    # Read-only mappings are not hashable themselves
+    if isinstance(value, tuple):
+        return tuple(_hash_key(item) for item in value)
+    if isinstance(value, Mapping):
+        return frozenset((key, _hash_key(item)) for key, item in value.items())
+    return value
+
+
+def slotted_model(cls: type, frozen: bool = False) -> type:
+    """
+    Create (or get the cached) slotted variant of a model class.
+
+    Args:
+        cls: Dataclass from ``klogs_pgw.models``
+        frozen: Make instances immutable (and hashable); list and dict
+            fields are stored as tuples and read-only mappings
+
+    Returns:
+        Generated class
+    """
+    key = (cls, frozen)
+    if key in _cache:
+        return _cache[key]
+
+    fields = dataclasses.fields(cls)
+    hints = typing.get_type_hints(cls)
+    names = [f.name for f in fields]
+    class_name = ("Frozen" if frozen else "") + cls.__name__
+    containers = {f.name for f in fields if _is_container(hints[f.name])}
+    namespace = {}
+    globs = {"_set": object.__setattr__, "_freeze": _freeze, "_thaw": _thaw}
+
+    # __init__
+    params = []
+    body = []
+    for f in fields:
+        if f.default is dataclasses.MISSING:
+            params.append(f.name)
+        else:
+            globs["_d_" + f.name] = f.default
+            params.append(f"{f.name}=_d_{f.name}")
+        if frozen and f.name in containers:
+            body.append(f"    _set(self, {f.name!r}, _freeze({f.name}))")
+        elif frozen:
+            body.append(f"    _set(self, {f.name!r}, {f.name})")
+        else:
+            body.append(f"    self.{f.name} = {f.name}")
+    init_src = f"def __init__(self, {', '.join(params)}):\n" + "\n".join(body or ["    pass"])
+
+    # to_dict / from_dict
+    drop_none = cls in _DROP_NONE
+    to_lines = ["def to_dict(self):", "    data = {}" if drop_none else "    return {"]
+    from_args = []
+    for f in fields:
+        kind, target = _field_kind(hints[f.name])
+        json_name = _json_name(f.name)
+        attr = f"self.{f.name}"
+        value_var = f"_v_{f.name}"
+        if kind == "model":
+            globs["_m_" + f.name] = target
+            expr = f"{attr}.to_dict() if {attr} is not None else None"
+            load = f"(_m_{f.name}.from_dict({value_var}) if {value_var} else None)"
+        elif kind == "list":
+            globs["_m_" + f.name] = target
+            expr = f"[v.to_dict() for v in {attr}] if {attr} else None"
+            load = f"([_m_{f.name}.from_dict(v) for v in {value_var}] if {value_var} else None)"
+        elif kind == "enum":
+            # Interned lookup table: wire value -> enum member
+            globs["_e_" + f.name] = {member.value: member for member in target}
+            expr = f"{attr}.value if {attr} is not None else None"
+            load = f"_e_{f.name}.get({value_var})"
+        elif frozen and f.name in containers:
+            expr = f"_thaw({attr})"
+            load = value_var
+        else:
+            expr = attr
+            load = value_var
+        if f.default is dataclasses.MISSING:
+            get = f"data[{json_name!r}]"
+        else:
+            get = f"data.get({json_name!r}, _d_{f.name})"
+        from_args.append((f.name, get, load, value_var))
+
+        if drop_none:
+            to_lines.append(f"    value = {expr}")
+            to_lines.append(f"    if value is not None: data[{json_name!r}] = value")
+        else:
+            to_lines.append(f"        {json_name!r}: {expr},")
+    to_lines.append("    return data" if drop_none else "    }")
+    to_src = "\n".join(to_lines)
+
+    from_lines = ["def from_dict(cls, data):"]
+    for name, get, load, value_var in from_args:
+        from_lines.append(f"    {value_var} = {get}")
+    from_lines.append("    return cls(" + ", ".join(f"{name}={load}" for name, _, load, _ in from_args) + ")")
+    from_src = "\n".join(from_lines)
+
+    fields_tuple = ", ".join(f"self.{name}" for name in names)
+    repr_parts = ", ".join(f"{name}={{self.{name}!r}}" for name in names)
+    misc_src = (
+        f"def _astuple(self):\n    return ({fields_tuple}{',' if len(names) == 1 else ''})\n"
+        f"def __repr__(self):\n    return f'{class_name}({repr_parts})'\n"
+    )
+
+    exec(init_src, globs, namespace)
+    exec(to_src, globs, namespace)
+    exec(from_src, globs, namespace)
+    exec(misc_src, globs, namespace)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __reduce__(self):
+        # Rebuild through __init__, which frozen instances also allow
+        if frozen:
+            return self.__class__, tuple(_thaw(value) for value in self._astuple())
+        return self.__class__, self._astuple()
+
+    namespace["from_dict"] = classmethod(namespace["from_dict"])
+    namespace["__eq__"] = __eq__
+    namespace["__reduce__"] = __reduce__
+    namespace["__slots__"] = tuple(names)
+    namespace["__doc__"] = cls.__doc__
+    namespace["__module__"] = __name__
+    namespace["__qualname__"] = class_name
+
+    if frozen:
+        def __setattr__(self, name, value):
+            raise dataclasses.FrozenInstanceError(f"cannot assign to field {name!r}")
+
+        def __delattr__(self, name):
+            raise dataclasses.FrozenInstanceError(f"cannot delete field {name!r}")
+
+        namespace["__setattr__"] = __setattr__
+        namespace["__delattr__"] = __delattr__
+        namespace["__hash__"] = lambda self: hash(_hash_key(self._astuple()))
+    else:
+        namespace["__hash__"] = None
+
+    # Lazy field iteration for streamed request bodies only reads attributes
+    if "iter_items" in cls.__dict__:
+        namespace["iter_items"] = cls.__dict__["iter_items"]
+
+    # Register first so self-referencing or nested lookups hit the cache
+    slotted = type(class_name, (), namespace)
+    _cache[key] = slotted
+    for f in fields:
+        kind, target = _field_kind(hints[f.name])
+        if kind in ("model", "list"):
+            globs["_m_" + f.name] = slotted_model(target, frozen)
+    return slotted
+
+
+ChargeType = models.ChargeType
+CreditCard = slotted_model(models.CreditCard)
+Reward = slotted_model(models.Reward)
+Address = slotted_model(models.Address)
+Product = slotted_model(models.Product)
+CreatePaymentRequest = slotted_model(models.CreatePaymentRequest)
+Error = slotted_model(models.Error)
+Response = slotted_model(models.Response)
+CardPaymentResponse = slotted_model(models.CardPaymentResponse)
+PaymentTokenResponse = slotted_model(models.PaymentTokenResponse)
+ProvisionCommitRequest = slotted_model(models.ProvisionCommitRequest)
+CommissionsRequest = slotted_model(models.CommissionsRequest)
+CommissionResponse = slotted_model(models.CommissionResponse)
+
+FrozenCreditCard = slotted_model(models.CreditCard, frozen=True)
+FrozenReward = slotted_model(models.Reward, frozen=True)
+FrozenAddress = slotted_model(models.Address, frozen=True)
+FrozenProduct = slotted_model(models.Product, frozen=True)
+FrozenCreatePaymentRequest = slotted_model(models.CreatePaymentRequest, frozen=True)
+FrozenError = slotted_model(models.Error, frozen=True)
+FrozenResponse = slotted_model(models.Response, frozen=True)
+FrozenCardPaymentResponse = slotted_model(models.CardPaymentResponse, frozen=True)
+FrozenPaymentTokenResponse = slotted_model(models.PaymentTokenResponse, frozen=True)
+FrozenProvisionCommitRequest = slotted_model(models.ProvisionCommitRequest, frozen=True)
+FrozenCommissionsRequest = slotted_model(models.CommissionsRequest, frozen=True)
+FrozenCommissionResponse = slotted_model(models.CommissionResponse, frozen=True)
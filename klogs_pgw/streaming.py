@@ -0,0 +1,122 @@
+"""Klogs Payment Gateway - Streaming JSON Request Bodies"""
+
+import json
+import zlib
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Matches the encoder settings requests uses for ``json=`` bodies
+_encoder = json.JSONEncoder(allow_nan=False)
+
+
+def iter_json(value: Any) -> Iterator[str]:
+    """
+    Encode a value to JSON incrementally.
+
+    Models exposing ``iter_items`` are walked lazily so that large nested
+    collections (e.g. products) are serialized one element at a time instead
+    of being materialized as a full dictionary first.
+
+    Args:
+        value: Model, dictionary, list or JSON scalar to encode
+
+    Yields:
+        JSON text fragments
+    """
+    if hasattr(value, 'iter_items'):
+        yield from _iter_object(value.iter_items())
+    elif hasattr(value, 'to_dict'):
+        yield from _encoder.iterencode(value.to_dict())
+    elif isinstance(value, Mapping):
+        yield from _iter_object(value.items())
+    elif isinstance(value, (list, tuple)):
+        yield '['
+        first = True
+        for item in value:
+            if not first:
+                yield ', '
+            first = False
+            yield from iter_json(item)
+        yield ']'
+    else:
+        yield _encoder.encode(value)
+
+
+def _key_str(key: Any) -> str:
+    """
+    Convert a dictionary key to a string the way the json module does.
+
+    Raises:
+        TypeError: If the key type cannot be used as a JSON object key
+    """
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, (int, float)):
+        # Reuse the encoder so float keys follow the allow_nan setting
+        return _encoder.encode(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _iter_object(items) -> Iterator[str]:
+    yield '{'
+    first = True
+    for key, value in items:
+        if not first:
+            yield ', '
+        first = False
+        yield _encoder.encode(_key_str(key))
+        yield ': '
+        yield from iter_json(value)
+    yield '}'
+
+
+def iter_json_chunks(body: Any, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     compress: bool = False) -> Iterator[bytes]:
+    """
+    Encode a request body as a stream of UTF-8 (optionally gzip) chunks.
+
+    Suitable for passing as ``data=`` to requests, which sends it with
+    chunked transfer encoding. Only about ``chunk_size`` bytes of encoded
+    output are held in memory at any time.
+
+    Args:
+        body: Request body (model with to_dict/iter_items, or plain JSON data)
+        chunk_size: Approximate size of each yielded chunk in bytes
+        compress: Gzip-compress the encoded body
+
+    Yields:
+        Encoded body chunks
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    buffer = []
+    buffered = 0
+
+    for fragment in iter_json(body):
+        data = fragment.encode('utf-8')
+        buffer.append(data)
+        buffered += len(data)
+        if buffered < chunk_size:
+            continue
+
+        chunk = b''.join(buffer)
+        buffer = []
+        buffered = 0
+        if compressor:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+
+    chunk = b''.join(buffer)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
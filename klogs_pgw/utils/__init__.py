@@ -2,25 +2,120 @@
 
 import hmac
 import hashlib
-import secrets
+import os
 import string
+import threading
 import time
+import weakref
 from datetime import datetime
 
 
 # Constants
+ALLOWED_CHARS = string.ascii_letters + string.digits
+
+# Maps random bytes to ALLOWED_CHARS, deleting bytes above the largest
+# multiple of the alphabet size so every character is equally likely
+_CHAR_TABLE = bytes(ord(ALLOWED_CHARS[i % len(ALLOWED_CHARS)]) for i in range(256))
+_REJECTED_BYTES = bytes(range(256 - 256 % len(ALLOWED_CHARS), 256))
+_NONCE_BUFFER_SIZE = 4096
+
+_nonce_buffers = threading.local()
+
+
+def _reset_nonce_buffers() -> None:
+    # A forked child must not reuse random bytes buffered by its parent
+    global _nonce_buffers
+    _nonce_buffers = threading.local()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_nonce_buffers)
+
+
 def create_random_string(length: int = 32) -> str:
     """
     Generate a URL-friendly random string.
     
+    Characters are drawn from a per-thread buffer of OS randomness, so
+    concurrent callers do not contend on a shared generator.
+    
     Args:
         length: Length of the random string (default: 32)
         
     Returns:
         Random string containing alphanumeric characters
     """
-    allowed_chars = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(allowed_chars) for _ in range(length))
+    local = _nonce_buffers
+    chars = getattr(local, 'chars', b'')
+    pos = getattr(local, 'pos', 0)
+    if len(chars) - pos < length:
+        chars = b''
+        while len(chars) < length:
+            chars += os.urandom(max(_NONCE_BUFFER_SIZE, length * 2)).translate(
+                _CHAR_TABLE, _REJECTED_BYTES)
+        pos = 0
+    local.chars = chars
+    local.pos = pos + length
+    return chars[pos:pos + length].decode('ascii')
+
+
+class _CellOwner:
+    """Per-thread token whose collection marks the thread's cell as retired"""
+    
+    __slots__ = ('__weakref__',)
+
+
+def _retire_cell(lock: threading.Lock, cells: dict, retired: list, cell: list) -> None:
+    with lock:
+        retired[0] += cell[0]
+        del cells[id(cell)]
+
+
+class ShardedCounter:
+    """
+    Counter that threads increment without sharing a lock.
+    
+    Each thread adds to its own cell; reading the value sums all cells.
+    When a thread exits, its cell is folded into a retired total so the
+    number of cells stays bounded by the number of live threads.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._cells = {}
+        self._retired = [0]
+        self._lock = threading.Lock()
+    
+    def add(self, amount: int = 1) -> None:
+        """
+        Increment the counter.
+        
+        Args:
+            amount: Amount to add (default: 1)
+        """
+        cell = getattr(self._local, 'cell', None)
+        if cell is None:
+            cell = [0]
+            owner = _CellOwner()
+            with self._lock:
+                self._cells[id(cell)] = cell
+            # The owner lives in this thread's local storage and is freed
+            # when the thread exits
+            weakref.finalize(owner, _retire_cell, self._lock, self._cells, self._retired, cell)
+            self._local.owner = owner
+            self._local.cell = cell
+        cell[0] += amount
+    
+    @property
+    def value(self) -> int:
+        """
+        Get the current total.
+        
+        Returns:
+            Sum of all threads' increments
+        """
+        with self._lock:
+            return self._retired[0] + sum(cell[0] for cell in self._cells.values())
 
 
 def utc_ticks() -> int:
@@ -53,6 +148,62 @@ def create_hmac_signature(cipher_text: str, secret_key: str) -> str:
     return mac.hexdigest()
 
 
+class RequestSigner:
+    """
+    Pre-keyed HMAC-SHA256 signer for a single set of credentials.
+    
+    The HMAC key schedule is computed once; each signature copies the keyed
+    state instead of re-deriving it from the secret key.
+    """
+    
+    def __init__(self, api_key: str, secret_key: str):
+        """
+        Initialize signer.
+        
+        Args:
+            api_key: API key
+            secret_key: Secret key
+        """
+        self.api_key = api_key
+        self._mac = hmac.new(secret_key.encode('utf-8'), digestmod=hashlib.sha256)
+    
+    def sign(self, cipher_text: str) -> str:
+        """
+        Create HMAC-SHA256 signature.
+        
+        Args:
+            cipher_text: Text to sign
+            
+        Returns:
+            Hex-encoded HMAC-SHA256 signature
+        """
+        mac = self._mac.copy()
+        mac.update(cipher_text.encode('utf-8'))
+        return mac.hexdigest()
+    
+    def create_auth_headers(self) -> dict:
+        """
+        Create authentication headers for Klogs API requests.
+        
+        Returns:
+            Dictionary containing authentication headers
+        """
+        random_string = create_random_string(32)
+        timestamp = str(utc_ticks())
+        
+        # Create signature: HMAC-SHA256(apiKey + randomString + timestamp, secretKey)
+        cipher_text = f"{self.api_key}{random_string}{timestamp}"
+        signature = self.sign(cipher_text)
+        
+        return {
+            "X-Api-Key": self.api_key,
+            "X-Klogs-Rnd": random_string,
+            "X-Klogs-Timestamp": timestamp,
+            "X-Klogs-Signature": signature,
+            "Content-Type": "application/json"
+        }
+
+
 def create_auth_headers(api_key: str, secret_key: str) -> dict:
     """
     Create authentication headers for Klogs API requests.
@@ -64,20 +215,7 @@ def create_auth_headers(api_key: str, secret_key: str) -> dict:
     Returns:
         Dictionary containing authentication headers
     """
-    random_string = create_random_string(32)
-    timestamp = str(utc_ticks())
-    
-    # Create signature: HMAC-SHA256(apiKey + randomString + timestamp, secretKey)
-    cipher_text = f"{api_key}{random_string}{timestamp}"
-    signature = create_hmac_signature(cipher_text, secret_key)
-    
-    return {
-        "X-Api-Key": api_key,
-        "X-Klogs-Rnd": random_string,
-        "X-Klogs-Timestamp": timestamp,
-        "X-Klogs-Signature": signature,
-        "Content-Type": "application/json"
-    }
+    return RequestSigner(api_key, secret_key).create_auth_headers()
 
 
 def is_success_status_code(status_code: int) -> bool:
@@ -0,0 +1,92 @@
+import json
+
+from klogs_pgw.audit import AuditLogger, redact, summarize
+from klogs_pgw.models import CreatePaymentRequest, CreditCard, Product
+
+
+def _request():
+    return CreatePaymentRequest(
+        amount=25.0, installment=1, reference_code="ref-1", currency="TRY",
+        card=CreditCard(card_holder_name="Jane Doe", card_number="4111111111111111",
+                        cvv="123", expire_month=12, expire_year=2030),
+        national_number="12345678901",
+        products=[Product(id="p-1"), Product(id="p-2")]
+    )
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_redact_masks_card_and_identity_fields():
+    data = redact(_request())
+    assert data["card"]["cardNumber"] == "411111******1111"
+    assert data["card"]["cvv"] == "***"
+    assert data["nationalNumber"] == "*********01"
+
+
+def test_redact_converts_nested_models():
+    data = redact({"wrapped": [{"card": _request().card}]})
+    assert data["wrapped"][0]["card"]["cardNumber"] == "411111******1111"
+    assert data["wrapped"][0]["card"]["cvv"] == "***"
+
+
+def test_summary_keeps_no_card_data():
+    summary = summarize(_request())
+    assert summary == {
+        "referenceCode": "ref-1",
+        "amount": 25.0,
+        "currency": "TRY",
+        "installment": 1,
+        "cardNumber": "411111******1111",
+        "productCount": 2
+    }
+    assert "4111111111111111" not in json.dumps(summarize(_request().to_dict()))
+
+
+def test_record_snapshots_body_before_it_is_reused(tmp_path):
+    path = str(tmp_path / "audit.log")
+    audit = AuditLogger(path, flush_interval=0.01)
+    request = _request()
+    audit.record("POST", "/api/v1/card-payment/pay", request, 200, 0.1)
+    request.amount = 99.0
+    request.reference_code = "ref-2"
+    audit.close()
+
+    (entry,) = _read(path)
+    assert entry["body"]["referenceCode"] == "ref-1"
+    assert entry["body"]["amount"] == 25.0
+    assert "1111111" not in json.dumps(entry)
+    assert "123" not in json.dumps(entry["body"])
+
+
+def test_full_buffer_drops_and_counts(tmp_path):
+    audit = AuditLogger(str(tmp_path / "audit.log"), capacity=0)
+    for _ in range(3):
+        audit.record("GET", "/x")
+    audit.close()
+    stats = audit.stats()
+    assert stats["dropped"] == 3
+    assert stats["recorded"] == 0
+    assert stats["written"] == 0
+
+
+def test_sampled_out_records_are_counted(tmp_path):
+    audit = AuditLogger(str(tmp_path / "audit.log"), sample_rate=0.0)
+    audit.record("GET", "/x")
+    audit.close()
+    assert audit.stats()["sampledOut"] == 1
+
+
+def test_unserializable_record_counts_error_and_writer_keeps_running(tmp_path):
+    path = str(tmp_path / "audit.log")
+    audit = AuditLogger(path, flush_interval=0.01)
+    # Tuple keys cannot be encoded as JSON
+    audit._buffer.append((0.0, "GET", "/bad", {(1, 2): "key"}, None, None, None))
+    audit.record("GET", "/good", {"amount": 1.0})
+    audit.close()
+
+    assert [entry["uri"] for entry in _read(path)] == ["/good"]
+    assert audit.stats()["errors"] == 1
+    assert audit.stats()["written"] == 1
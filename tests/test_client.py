@@ -0,0 +1,132 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from klogs_pgw.client import KlogsHttpClient
+
+
+class _Server:
+    """Local gateway stub that records requests and replies or hangs up."""
+
+    def __init__(self, hang_up=False):
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                server.requests.append((self.command, self.path, dict(self.headers)))
+                if hang_up:
+                    # The request was received; the response is lost
+                    self.close_connection = True
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    return
+                payload = json.dumps({"success": True}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_port
+        self.url = f"http://127.0.0.1:{self.port}"
+        threading.Thread(target=self.httpd.serve_forever, args=(0.01,), daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def servers():
+    started = []
+
+    def start(**kwargs):
+        server = _Server(**kwargs)
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.stop()
+
+
+def _closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def _client(primary, fallback):
+    return KlogsHttpClient(primary, "api-key", "secret-key", endpoints=[fallback], timeout=5)
+
+
+def test_post_is_not_retried_after_read_error(servers):
+    primary, fallback = servers(hang_up=True), servers()
+    client = _client(primary.url, fallback.url)
+
+    with pytest.raises(requests.ConnectionError):
+        client.post("/pay", body={"amount": 1})
+    assert len(primary.requests) == 1
+    assert fallback.requests == []
+
+
+def test_get_is_retried_after_read_error(servers):
+    primary, fallback = servers(hang_up=True), servers()
+    client = _client(primary.url, fallback.url)
+
+    assert client.get("/commissions") == {"success": True}
+    assert len(primary.requests) == 1
+    assert len(fallback.requests) == 1
+
+
+def test_post_is_retried_after_connect_error(servers):
+    fallback = servers()
+    client = _client(_closed_port_url(), fallback.url)
+
+    assert client.post("/pay", body={"amount": 1}) == {"success": True}
+    assert len(fallback.requests) == 1
+
+
+def test_post_is_retried_after_tls_handshake_error(servers):
+    # A TLS client hello sent to a plain HTTP server fails the handshake
+    plain, fallback = servers(), servers()
+    client = _client(f"https://127.0.0.1:{plain.port}", fallback.url)
+
+    assert client.post("/pay", body={"amount": 1}) == {"success": True}
+    assert plain.requests == []
+    assert len(fallback.requests) == 1
+
+
+def test_retry_is_signed_again(servers):
+    primary, fallback = servers(hang_up=True), servers()
+    client = _client(primary.url, fallback.url)
+
+    client.get("/commissions")
+    first, second = primary.requests[0][2], fallback.requests[0][2]
+    assert first["X-Klogs-Rnd"] != second["X-Klogs-Rnd"]
+    assert first["X-Klogs-Signature"] != second["X-Klogs-Signature"]
+
+
+def test_pinned_endpoint_keeps_host_header(servers):
+    server = servers()
+    client = KlogsHttpClient(f"http://gateway.invalid:{server.port}", "api-key", "secret-key",
+                             endpoints=[(f"http://gateway.invalid:{server.port}", "127.0.0.1")],
+                             timeout=5)
+
+    assert client.get("/status") == {"success": True}
+    assert server.requests[0][2]["Host"] == f"gateway.invalid:{server.port}"
@@ -0,0 +1,59 @@
+import time
+
+from klogs_pgw.endpoints import EndpointSelector
+
+
+def _urls(selector):
+    return [endpoint.url for endpoint in selector.ordered()]
+
+
+def test_fastest_healthy_endpoint_comes_first():
+    selector = EndpointSelector(["https://a", "https://b"])
+    a, b = selector.endpoints
+    selector.record_success(a, 0.2)
+    selector.record_success(b, 0.05)
+    assert _urls(selector) == ["https://b", "https://a"]
+
+
+def test_endpoint_is_ejected_and_recovers_after_window():
+    selector = EndpointSelector(["https://a", "https://b"], eject_after=2, eject_seconds=0.1)
+    a, b = selector.endpoints
+    selector.record_success(a, 0.01)
+    selector.record_success(b, 0.1)
+
+    selector.record_failure(a)
+    selector.record_failure(a)
+    assert _urls(selector) == ["https://b", "https://a"]
+    assert [s["healthy"] for s in selector.stats()] == [False, True]
+
+    time.sleep(0.15)
+    assert [s["healthy"] for s in selector.stats()] == [True, True]
+    assert _urls(selector)[0] == "https://a"
+
+
+def test_unmeasured_failing_endpoint_is_probed_again():
+    selector = EndpointSelector(["https://a", "https://b"], eject_seconds=0.1)
+    a, b = selector.endpoints
+    selector.record_success(b, 0.5)
+    selector.record_failure(a)
+    assert _urls(selector) == ["https://b", "https://a"]
+
+    time.sleep(0.15)
+    assert _urls(selector)[0] == "https://a"
+
+
+def test_error_rate_decays_over_time():
+    selector = EndpointSelector(["https://a"], error_half_life=30.0)
+    endpoint = selector.endpoints[0]
+    selector.record_failure(endpoint, 0.1)
+    rate = endpoint.error_rate
+    later = endpoint.error_updated + 30.0
+    assert abs(endpoint.decayed_error_rate(later, 30.0) - rate / 2) < 1e-9
+
+
+def test_pinned_endpoint_keeps_url():
+    selector = EndpointSelector(["https://pgw.example.com", ("https://pgw.example.com", "203.0.113.10")])
+    assert [(e.url, e.address) for e in selector.endpoints] == [
+        ("https://pgw.example.com", None),
+        ("https://pgw.example.com", "203.0.113.10")
+    ]
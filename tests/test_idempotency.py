@@ -0,0 +1,180 @@
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from klogs_pgw import MultiTenantKlogsClient
+from klogs_pgw.idempotency import IdempotencyRegistry, SqliteIdempotencyStore
+from klogs_pgw.models import CreatePaymentRequest, PaymentTokenResponse
+from klogs_pgw.services.card_payment import CardPaymentService
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_concurrent_calls_share_one_in_flight_call():
+    registry = IdempotencyRegistry()
+    started = threading.Event()
+    finish = threading.Event()
+    calls = []
+
+    def send():
+        calls.append(1)
+        started.set()
+        finish.wait(5)
+        return PaymentTokenResponse(success=True, token="tok")
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.run("ref-1", send, PaymentTokenResponse)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    time.sleep(0.05)
+    finish.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+
+
+def test_shared_call_error_is_raised_to_every_caller_and_not_cached():
+    registry = IdempotencyRegistry()
+
+    def fail():
+        raise Exception("gateway down")
+
+    with pytest.raises(Exception, match="gateway down"):
+        registry.run("ref-1", fail, PaymentTokenResponse)
+    result = registry.run("ref-1", lambda: PaymentTokenResponse(success=True), PaymentTokenResponse)
+    assert result.success
+
+
+def test_outcome_expires_after_ttl():
+    registry = IdempotencyRegistry(ttl=0.05)
+    calls = []
+
+    def send():
+        calls.append(1)
+        return PaymentTokenResponse(success=True, token=str(len(calls)))
+
+    assert registry.run("ref-1", send, PaymentTokenResponse).token == "1"
+    assert registry.run("ref-1", send, PaymentTokenResponse).token == "1"
+    time.sleep(0.1)
+    assert registry.run("ref-1", send, PaymentTokenResponse).token == "2"
+
+
+def test_in_flight_calls_are_bounded():
+    registry = IdempotencyRegistry(max_in_flight=0)
+    with pytest.raises(Exception, match="Too many in-flight"):
+        registry.run("ref-1", lambda: PaymentTokenResponse(), PaymentTokenResponse)
+
+
+WORKER = textwrap.dedent("""
+    import sys, time
+    from klogs_pgw.idempotency import IdempotencyRegistry, SqliteIdempotencyStore
+    from klogs_pgw.models import PaymentTokenResponse
+
+    db, calls, name = sys.argv[1:]
+
+    def send():
+        with open(calls, "a") as f:
+            f.write(name + "\\n")
+        time.sleep(1.0)
+        return PaymentTokenResponse(success=True, token=name)
+
+    registry = IdempotencyRegistry(store=SqliteIdempotencyStore(db), lease=0.3, wait_timeout=10)
+    print(registry.run("ref-1", send, PaymentTokenResponse).token)
+""")
+
+
+def test_processes_sharing_a_store_send_once(tmp_path):
+    db = str(tmp_path / "idempotency.db")
+    calls = str(tmp_path / "calls.txt")
+    SqliteIdempotencyStore(db)
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    workers = [subprocess.Popen([sys.executable, "-c", WORKER, db, calls, name],
+                                stdout=subprocess.PIPE, text=True, env=env)
+               for name in ("a", "b")]
+    outputs = [worker.communicate(timeout=30)[0].strip() for worker in workers]
+
+    with open(calls) as f:
+        senders = f.read().split()
+    # The call outlives the lease several times over; renewal keeps it claimed
+    assert len(senders) == 1
+    assert outputs == senders * 2
+
+
+def test_abandoned_claim_reports_unknown_outcome(tmp_path):
+    db = str(tmp_path / "idempotency.db")
+    crashed = SqliteIdempotencyStore(db)
+    assert crashed.claim("ref-1", lease=0.01)
+    time.sleep(0.05)
+
+    registry = IdempotencyRegistry(store=SqliteIdempotencyStore(db))
+    with pytest.raises(Exception, match="Outcome unknown"):
+        registry.run("ref-1", lambda: PaymentTokenResponse(success=True), PaymentTokenResponse)
+
+    crashed.release("ref-1")
+    assert registry.run("ref-1", lambda: PaymentTokenResponse(success=True), PaymentTokenResponse).success
+
+
+def test_different_fingerprint_for_same_key_raises():
+    registry = IdempotencyRegistry()
+    registry.run("ref-1", lambda: PaymentTokenResponse(success=True), PaymentTokenResponse, "10.0|TRY")
+
+    assert registry.run("ref-1", lambda: None, PaymentTokenResponse, "10.0|TRY").success
+    with pytest.raises(Exception, match="different request"):
+        registry.run("ref-1", lambda: None, PaymentTokenResponse, "99.0|TRY")
+
+
+def test_different_fingerprint_is_rejected_across_processes(tmp_path):
+    db = str(tmp_path / "idempotency.db")
+    first = IdempotencyRegistry(store=SqliteIdempotencyStore(db))
+    second = IdempotencyRegistry(store=SqliteIdempotencyStore(db))
+    first.run("ref-1", lambda: PaymentTokenResponse(success=True), PaymentTokenResponse, "10.0|TRY")
+
+    with pytest.raises(Exception, match="different request"):
+        second.run("ref-1", lambda: None, PaymentTokenResponse, "99.0|TRY")
+    assert second.run("ref-1", lambda: None, PaymentTokenResponse, "10.0|TRY").success
+
+
+class _StubHttp:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, resource_uri, body=None, response_class=None, **kwargs):
+        self.posts.append(body)
+        return response_class(success=True)
+
+
+def test_pay_keys_are_scoped_per_merchant():
+    registry = IdempotencyRegistry()
+    http = _StubHttp()
+    request = CreatePaymentRequest(amount=10.0, installment=1, reference_code="order-1", currency="TRY")
+    merchant_a = CardPaymentService(http, registry, "merchant-a")
+    merchant_b = CardPaymentService(http, registry, "merchant-b")
+
+    merchant_a.pay(request)
+    merchant_a.pay(request)
+    merchant_b.pay(request)
+    assert len(http.posts) == 2
+
+    changed = CreatePaymentRequest(amount=20.0, installment=1, reference_code="order-1", currency="TRY")
+    with pytest.raises(Exception, match="different request"):
+        merchant_a.pay(changed)
+
+
+def test_multi_tenant_client_passes_scoped_registry():
+    registry = IdempotencyRegistry()
+    client = MultiTenantKlogsClient(credentials={"merchant-a": ("api-key", "secret-key")},
+                                    idempotency_registry=registry)
+    service = client.merchant("merchant-a").card_payment
+    assert service.idempotency_registry is registry
+    assert service.idempotency_scope == "merchant-a"
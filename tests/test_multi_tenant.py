@@ -0,0 +1,60 @@
+import pytest
+
+from klogs_pgw import MultiTenantKlogsClient
+
+
+def _client(**kwargs):
+    credentials = {f"merchant-{i}": (f"api-key-{i}", f"secret-key-{i}") for i in range(3)}
+    return MultiTenantKlogsClient(credentials=credentials, **kwargs)
+
+
+def test_signers_are_cached_per_merchant():
+    client = _client()
+    assert client._get_signer("merchant-0") is client._get_signer("merchant-0")
+    assert client._get_signer("merchant-0") is not client._get_signer("merchant-1")
+
+
+def test_least_recently_used_signer_is_evicted():
+    client = _client(max_signers=2)
+    first = client._get_signer("merchant-0")
+    client._get_signer("merchant-1")
+    client._get_signer("merchant-0")
+    client._get_signer("merchant-2")
+
+    assert list(client._signers) == ["merchant-0", "merchant-2"]
+    assert client._get_signer("merchant-0") is first
+
+
+def test_unknown_merchant_raises():
+    client = _client()
+    with pytest.raises(Exception, match="Unknown merchant: merchant-9"):
+        client.merchant("merchant-9")
+
+
+def test_credential_provider_is_used_for_unknown_merchants():
+    lookups = []
+
+    def provider(merchant_id):
+        lookups.append(merchant_id)
+        return ("api-key", "secret-key") if merchant_id == "merchant-9" else None
+
+    client = _client(credential_provider=provider)
+    client.merchant("merchant-9")
+    client.merchant("merchant-9")
+    assert lookups == ["merchant-9"]
+    with pytest.raises(Exception, match="Unknown merchant"):
+        client.merchant("merchant-10")
+
+
+def test_removed_merchant_is_unknown():
+    client = _client()
+    client.merchant("merchant-0")
+    client.remove_merchant("merchant-0")
+    with pytest.raises(Exception, match="Unknown merchant"):
+        client.merchant("merchant-0")
+
+
+def test_merchant_requests_are_signed_with_its_credentials():
+    client = _client()
+    signer = client.merchant("merchant-1").card_payment.http.signer
+    assert signer.create_auth_headers()["X-Api-Key"] == "api-key-1"
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from klogs_pgw import scheduler as scheduler_module
+from klogs_pgw.scheduler import Priority, QueueFullError, RequestScheduler
+
+
+def _wait_for_queued(scheduler, priority, count):
+    deadline = time.monotonic() + 5
+    while scheduler.stats()["classes"][priority.value]["queued"] < count:
+        assert time.monotonic() < deadline, "waiters were not queued"
+        time.sleep(0.001)
+
+
+def test_freed_slots_are_shared_by_weight():
+    scheduler = RequestScheduler(max_concurrency=1)
+    scheduler.acquire()
+    order = []
+
+    def worker(priority):
+        scheduler.acquire(priority)
+        order.append(priority)
+        scheduler.release()
+
+    threads = []
+    for priority in Priority:
+        for i in range(12):
+            thread = threading.Thread(target=worker, args=(priority,))
+            thread.start()
+            threads.append(thread)
+            _wait_for_queued(scheduler, priority, i + 1)
+
+    scheduler.release()
+    for thread in threads:
+        thread.join()
+
+    first_round = order[:12]
+    assert first_round.count(Priority.CRITICAL) == 8
+    assert first_round.count(Priority.NORMAL) == 3
+    assert first_round.count(Priority.BACKGROUND) == 1
+    assert len(order) == 36
+    assert scheduler.stats()["active"] == 0
+
+
+def test_full_queue_rejects_immediately():
+    scheduler = RequestScheduler(max_concurrency=1, queue_limits={Priority.BACKGROUND: 1})
+    scheduler.acquire()
+    waiter = threading.Thread(target=lambda: (scheduler.acquire(Priority.BACKGROUND), scheduler.release()))
+    waiter.start()
+    _wait_for_queued(scheduler, Priority.BACKGROUND, 1)
+
+    with pytest.raises(QueueFullError):
+        scheduler.acquire(Priority.BACKGROUND)
+
+    scheduler.release()
+    waiter.join()
+    assert scheduler.stats()["classes"]["background"]["rejected"] == 1
+
+
+def test_wait_timeout_raises_and_leaves_queue():
+    scheduler = RequestScheduler(max_concurrency=1, wait_timeout=0.01)
+    scheduler.acquire()
+
+    with pytest.raises(Exception, match="Timed out"):
+        scheduler.acquire(Priority.NORMAL)
+
+    stats = scheduler.stats()
+    assert stats["classes"]["normal"]["queued"] == 0
+    assert stats["classes"]["normal"]["timedOut"] == 1
+
+
+def test_slot_granted_as_wait_times_out_is_kept(monkeypatch):
+    scheduler = RequestScheduler(max_concurrency=1, wait_timeout=0.01)
+
+    class GrantedOnTimeout(threading.Event):
+        def wait(self, timeout=None):
+            # The holder releases after the wait expired but before the
+            # waiter re-checks under the lock
+            scheduler.release()
+            return False
+
+    class RacingWaiter(scheduler_module._Waiter):
+        def __init__(self):
+            super().__init__()
+            self.event = GrantedOnTimeout()
+
+    monkeypatch.setattr(scheduler_module, "_Waiter", RacingWaiter)
+    scheduler.acquire()
+    scheduler.acquire(Priority.NORMAL)
+
+    stats = scheduler.stats()
+    assert stats["active"] == 1
+    assert stats["classes"]["normal"]["timedOut"] == 0
+    assert stats["classes"]["normal"]["queued"] == 0
+    scheduler.release()
+    assert scheduler.stats()["active"] == 0
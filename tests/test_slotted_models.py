@@ -0,0 +1,96 @@
+import dataclasses
+import pickle
+
+import pytest
+
+from klogs_pgw import models, slotted_models
+from klogs_pgw.models import ChargeType
+
+
+def _samples():
+    card = models.CreditCard(card_holder_name="Jane Doe", card_number="4111111111111111",
+                             cvv="123", expire_month=12, expire_year=2030)
+    address = models.Address(name="Jane", surname="Doe", country_code="TR", city="İstanbul",
+                             postal_code="34000", phone="+905550000000")
+    product = models.Product(id="p-1", category="books", quantity=2.0, code="B1",
+                             description="Book", price=12.5)
+    error = models.Error(summary="declined")
+    return [
+        card,
+        models.Reward(amount=5.0, use_reward=True),
+        address,
+        product,
+        models.CreatePaymentRequest(
+            amount=25.0, installment=3, token="tok", reference_code="ref-1", card=card,
+            reward=models.Reward(amount=1.0), invoice=address, shipping=address,
+            explanation="order 1", use_3d=True, additional_data={"channel": "web"},
+            currency="TRY", email="jane@example.com", phone="+905550000000",
+            return_url="https://shop.example.com/return", charge_type=ChargeType.PROVISION,
+            payment_system_id="ps-1", national_number="12345678901", products=[product, product]
+        ),
+        error,
+        models.Response(success=False, error=error),
+        models.CardPaymentResponse(success=True, behavior="redirect", link="https://pay"),
+        models.PaymentTokenResponse(success=True, token="tok"),
+        models.ProvisionCommitRequest(reference_code="ref-1", amount=10.0),
+        models.CommissionsRequest(amount=100.0, bin_number="411111", currency="TRY"),
+        models.CommissionResponse(success=True, installments=[{"count": 3, "rate": 1.5}])
+    ]
+
+
+SAMPLES = _samples()
+IDS = [type(sample).__name__ for sample in SAMPLES]
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+@pytest.mark.parametrize("sample", SAMPLES, ids=IDS)
+def test_round_trip_matches_regular_model(sample, frozen):
+    slotted = slotted_models.slotted_model(type(sample), frozen)
+    instance = slotted.from_dict(sample.to_dict())
+
+    assert instance.to_dict() == sample.to_dict()
+    assert slotted.from_dict(instance.to_dict()) == instance
+    assert pickle.loads(pickle.dumps(instance)) == instance
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=IDS)
+def test_constructor_matches_regular_model(sample):
+    slotted = getattr(slotted_models, type(sample).__name__)
+    fields = {f.name: getattr(sample, f.name) for f in dataclasses.fields(sample)}
+    assert slotted(**fields).to_dict() == sample.to_dict()
+
+
+def test_request_from_dict_restores_nested_models():
+    sample = SAMPLES[4]
+    request = slotted_models.CreatePaymentRequest.from_dict(sample.to_dict())
+
+    assert isinstance(request.card, slotted_models.CreditCard)
+    assert isinstance(request.products[0], slotted_models.Product)
+    assert request.charge_type is ChargeType.PROVISION
+    assert request.use_3d is True
+    assert request.return_url == sample.return_url
+    assert request.additional_data == {"channel": "web"}
+
+
+def test_frozen_request_with_products_is_hashable_and_immutable():
+    product = slotted_models.FrozenProduct(id="p-1", price=1.0)
+    request = slotted_models.FrozenCreatePaymentRequest(
+        amount=1.0, installment=1, products=[product], additional_data={"a": "b"})
+    same = slotted_models.FrozenCreatePaymentRequest(
+        amount=1.0, installment=1, products=[product], additional_data={"a": "b"})
+
+    assert hash(request) == hash(same)
+    assert {request, same} == {request}
+    assert isinstance(request.to_dict()["products"], list)
+    assert isinstance(request.to_dict()["additionalData"], dict)
+    with pytest.raises(AttributeError):
+        request.products.append(product)
+    with pytest.raises(TypeError):
+        request.additional_data["a"] = "c"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        request.amount = 2.0
+
+
+def test_frozen_response_with_nested_dicts_is_hashable():
+    response = slotted_models.FrozenCommissionResponse(installments=[{"count": 3}])
+    assert hash(response) == hash(slotted_models.FrozenCommissionResponse.from_dict(response.to_dict()))
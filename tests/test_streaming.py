@@ -0,0 +1,53 @@
+import gzip
+import json
+
+import pytest
+
+from klogs_pgw import slotted_models
+from klogs_pgw.models import Address, ChargeType, CreatePaymentRequest, CreditCard, Product
+from klogs_pgw.streaming import iter_json, iter_json_chunks
+
+
+def _payment_request(module):
+    return module.CreatePaymentRequest(
+        amount=150.5,
+        installment=1,
+        reference_code="ref-1",
+        card=module.CreditCard(card_holder_name="Jane Doe", card_number="4111111111111111",
+                               cvv="123", expire_month=12, expire_year=2030),
+        invoice=module.Address(name="Jane", city="İstanbul"),
+        additional_data={"note": "çay"},
+        charge_type=ChargeType.DIRECT_SALE,
+        products=[module.Product(id=str(i), quantity=1, price=1.5) for i in range(100)]
+    )
+
+
+class _Models:
+    CreatePaymentRequest = CreatePaymentRequest
+    CreditCard = CreditCard
+    Address = Address
+    Product = Product
+
+
+@pytest.mark.parametrize("module", [_Models, slotted_models])
+@pytest.mark.parametrize("chunk_size", [1, 64, 64 * 1024])
+def test_streamed_body_matches_to_dict(module, chunk_size):
+    request = _payment_request(module)
+    body = b"".join(iter_json_chunks(request, chunk_size))
+    assert json.loads(body.decode("utf-8")) == request.to_dict()
+
+
+def test_compressed_body_matches_to_dict():
+    request = _payment_request(_Models)
+    body = b"".join(iter_json_chunks(request, 256, compress=True))
+    assert json.loads(gzip.decompress(body)) == request.to_dict()
+
+
+def test_streamed_dict_matches_json_module():
+    data = {"a": [1, 2.5, None, True], 1: "int", 2.5: "float", True: "bool", None: "null", "nested": {"b": ()}}
+    assert "".join(iter_json(data)) == json.dumps(data)
+
+
+def test_unsupported_key_type_is_rejected():
+    with pytest.raises(TypeError):
+        "".join(iter_json({(1, 2): "tuple"}))
@@ -0,0 +1,50 @@
+import gc
+import threading
+
+from klogs_pgw import KlogsClient
+from klogs_pgw.utils import ShardedCounter
+
+
+def _run_threads(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_counter_sums_all_threads():
+    counter = ShardedCounter()
+
+    def work():
+        for _ in range(1000):
+            counter.add()
+
+    _run_threads(8, work)
+    counter.add(5)
+    assert counter.value == 8005
+
+
+def test_exited_threads_are_folded_into_retired_total():
+    counter = ShardedCounter()
+    _run_threads(50, lambda: counter.add(2))
+    gc.collect()
+
+    assert counter._retired[0] == 100
+    assert len(counter._cells) == 0
+    assert counter.value == 100
+
+
+def test_each_thread_gets_its_own_session_with_client_settings():
+    client = KlogsClient("api-key", "secret-key", proxies={"https": "http://proxy:3128"},
+                         verify="/etc/ssl/ca.pem")
+    http = client.http_client
+    sessions = []
+    _run_threads(2, lambda: sessions.append(http.session))
+
+    assert sessions[0] is not sessions[1]
+    for session in sessions:
+        assert session.proxies == {"https": "http://proxy:3128"}
+        assert session.verify == "/etc/ssl/ca.pem"
+        assert session.get_adapter("https://pgw.klogs.io") is http._adapter
+    assert http.session is http.session